@@ -0,0 +1,341 @@
+"""
+Async Linker - asyncio-native AutoLinker API for embedding in services.
+
+AsyncAutoLinker mirrors AutoLinker (aget_link, alookup_term,
+agenerate_linked_text, aprocess_directory) without blocking the event loop.
+It wraps the synchronous objects, so the cache, static table, source stats
+and config are shared, and it reuses the same planning, caching and
+link-insertion code, so results match the sync path.
+
+HTTP goes through aiohttp (pooled connections, bounded concurrency) when it
+is installed: pip install aiohttp. Without it, each source fetch runs the
+sync fetcher in a worker thread, which still keeps the event loop free.
+
+Usage:
+    async with AsyncAutoLinker(max_concurrency=16) as linker:
+        url, source = await linker.aget_link("Einstein", "physicist")
+        linked = await linker.agenerate_linked_text(text)
+"""
+
+import asyncio
+import codecs
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+# aiohttp is optional: without it fetches fall back to threads
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+from auto_linker import AutoLinker
+from config import OUTPUT_SETTINGS
+from link_fetcher import LinkFetcher, SEP_ENTRY_LINK_PATTERN, SOURCE_NAMES
+from probe_engine import EXISTS_STATUSES, HEAD_UNSUPPORTED
+
+# Sync fetcher method per source, used for the thread fallback
+SYNC_FETCHERS = {
+    "SEP": "fetch_sep_link",
+    "PhilPapers": "fetch_philpapers_link",
+    "Scholarpedia": "fetch_scholarpedia_link",
+    "arXiv": "fetch_arxiv_link",
+    "IEP": "fetch_iep_link",
+    "Wikipedia": "fetch_wikipedia_link",
+}
+
+
+class AsyncLinkFetcher:
+    """Non-blocking counterpart of LinkFetcher, sharing its cache and config."""
+
+    def __init__(self, fetcher: Optional[LinkFetcher] = None, max_concurrency: int = 8,
+                 timeout: float = 5, max_probe_bytes: int = 4096):
+        self.fetcher = fetcher or LinkFetcher(verbose=False)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_probe_bytes = max_probe_bytes
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+        # Concurrent requests for the same term share one resolution
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def _get_session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers=dict(self.fetcher.session.headers),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        """Close pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _resolve_url(self, url: str) -> Optional[str]:
+        """Async ProbeEngine.probe: HEAD, then a small ranged GET. Returns the canonical URL or None."""
+        session = await self._get_session()
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                if response.status not in HEAD_UNSUPPORTED:
+                    if response.status != 200:
+                        return None
+                    return str(response.url) if response.history else url
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+
+        # HEAD rejected or failed: streamed, ranged GET that stops after a few KB
+        try:
+            headers = {"Range": f"bytes=0-{self.max_probe_bytes - 1}"}
+            async with session.get(url, allow_redirects=True, headers=headers) as response:
+                await response.content.read(self.max_probe_bytes)
+                if response.status not in EXISTS_STATUSES:
+                    return None
+                return str(response.url) if response.history else url
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+    async def _find_first(self, url: str, pattern: "re.Pattern", max_bytes: int = 256 * 1024) -> Optional["re.Match"]:
+        """Async ProbeEngine.find_first: stream a page until pattern matches."""
+        session = await self._get_session()
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status != 200:
+                    return None
+                try:
+                    decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                buffer = ""
+                bytes_read = 0
+                async for chunk in response.content.iter_chunked(8192):
+                    bytes_read += len(chunk)
+                    buffer += decoder.decode(chunk)
+                    match = pattern.search(buffer)
+                    if match:
+                        return match
+                    if bytes_read >= max_bytes:
+                        return None
+                    buffer = buffer[-1024:]
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        return None
+
+    async def fetch_sep_link(self, term: str) -> Optional[str]:
+        for url in self.fetcher.sep_entry_urls(term):
+            resolved = await self._resolve_url(url)
+            if resolved:
+                return resolved
+
+        match = await self._find_first(self.fetcher.sep_search_url(term), SEP_ENTRY_LINK_PATTERN)
+        if match:
+            return urljoin(self.fetcher.base_urls["SEP"], match.group(1))
+        return None
+
+    async def fetch_wikipedia_link(self, term: str) -> Optional[str]:
+        api_url = f"{self.fetcher.base_urls['Wikipedia']}/w/api.php"
+        session = await self._get_session()
+        params = {"action": "query", "titles": term, "format": "json", "redirects": 1}
+        search_params = {"action": "opensearch", "search": term, "limit": 1, "format": "json"}
+
+        try:
+            async with session.get(api_url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                data = await response.json(content_type=None)
+            pages = data.get("query", {}).get("pages", {})
+
+            for page_id, page_data in pages.items():
+                if page_id != "-1":  # -1 means page not found
+                    return self.fetcher.wikipedia_article_url(page_data.get("title", term))
+
+            async with session.get(api_url, params=search_params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                data = await response.json(content_type=None)
+
+            if len(data) >= 4 and data[3]:  # URLs are in index 3
+                return data[3][0]
+
+        except Exception as e:
+            self.fetcher.log(f"Wikipedia API error: {e}")
+
+        return None
+
+    async def fetch(self, source: str, search_term: str) -> Optional[str]:
+        """Fetch a link from one source without blocking the event loop."""
+        async with self._semaphore:
+            if not HAS_AIOHTTP:
+                return await asyncio.to_thread(getattr(self.fetcher, SYNC_FETCHERS[source]), search_term)
+            if source == "SEP":
+                return await self.fetch_sep_link(search_term)
+            if source == "Wikipedia":
+                return await self.fetch_wikipedia_link(search_term)
+            if source == "Scholarpedia":
+                return await self._resolve_url(self.fetcher.scholarpedia_url(search_term))
+            if source == "IEP":
+                return await self._resolve_url(self.fetcher.iep_url(search_term))
+            # PhilPapers and arXiv just build search URLs
+            return getattr(self.fetcher, SYNC_FETCHERS[source])(search_term)
+
+    async def aresolve_from_sources(self, term: str, category: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """Async LinkFetcher.resolve_from_sources."""
+        fetcher = self.fetcher
+        search_term, stats_category, source_order = fetcher.plan_resolution(term, category, explore=True)
+
+        result = (None, "")
+        for source in source_order:
+            fetcher.log(f"  Trying {source} for '{search_term}'...", end=" ")
+
+            started = time.perf_counter()
+            with fetcher.tracer.span("fetch", category="network", source=source, term=search_term):
+                url = await self.fetch(source, search_term)
+            fetcher.source_stats.record(stats_category, source, url is not None,
+                                        time.perf_counter() - started)
+
+            if url:
+                fetcher.log("Found!")
+                result = (url, SOURCE_NAMES[source])
+                break
+            else:
+                fetcher.log("Not found")
+
+            # Small delay to be respectful to servers
+            await asyncio.sleep(fetcher.request_delay)
+
+        if fetcher.cache_batch_size == 1:
+            await asyncio.to_thread(fetcher.source_stats.save)
+        return result
+
+    async def aget_link(self, term: str, category: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """Async LinkFetcher.get_link: static table, then cache, then the sources."""
+        local = self.fetcher.local_link(term, category)
+        if local is not None:
+            return local
+
+        key = self.fetcher.cache_key(term, category)  # Spelling variants share one lookup
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            with self.fetcher.tracer.span("get_link", category="term", term=term, term_category=category or "any"):
+                url, source_name = await self.aresolve_from_sources(term, category)
+            if url:
+                await asyncio.to_thread(self.fetcher.store_link, term, category, url, source_name)
+            future.set_result((url, source_name))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; waiters still get it, and nobody waiting is fine
+            raise
+        finally:
+            del self._in_flight[key]
+        return url, source_name
+
+
+class AsyncAutoLinker:
+    """asyncio-native AutoLinker sharing scanner, fetcher, cache and config with the sync one."""
+
+    def __init__(self, linker: Optional[AutoLinker] = None, max_concurrency: int = 8):
+        self.linker = linker or AutoLinker(verbose=False)
+        self.fetcher = AsyncLinkFetcher(self.linker.fetcher, max_concurrency=max_concurrency)
+
+    async def __aenter__(self) -> "AsyncAutoLinker":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close connections and flush buffered cache writes."""
+        await self.fetcher.close()
+        await asyncio.to_thread(self.linker.fetcher.flush)
+
+    async def aget_link(self, term: str, category: Optional[str] = None) -> Tuple[Optional[str], str]:
+        return await self.fetcher.aget_link(term, category)
+
+    async def alookup_term(self, term: str, category: Optional[str] = None) -> Dict:
+        """Async AutoLinker.lookup_term."""
+        self.linker.log(f"\nLooking up: {term}" + (f" ({category})" if category else ""))
+        url, source = await self.aget_link(term, category)
+        return self.linker._lookup_result(term, category, url, source)
+
+    async def _resolve_all(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple[Optional[str], str]]:
+        """Resolve (term, category) pairs concurrently."""
+        unique = list(dict.fromkeys(keys))
+        results = await asyncio.gather(*(self.aget_link(term, category) for term, category in unique))
+        return dict(zip(unique, results))
+
+    async def agenerate_linked_text(self, text: str, link_all: bool = False,
+                                    link_format: Optional[str] = None) -> str:
+        """Async AutoLinker.generate_linked_text; terms are resolved concurrently."""
+        link_format = link_format or OUTPUT_SETTINGS.get("link_format", "markdown")
+        terms = await asyncio.to_thread(self.linker._linkable_terms, text, link_all)
+        links = await self._resolve_all([(t.term, t.category) for t in terms])
+        return self.linker._apply_links(text, terms, links, link_format)
+
+    async def agenerate_link_index(self, file_path: Path) -> Dict:
+        """Async AutoLinker.generate_link_index."""
+        terms = await asyncio.to_thread(self.linker.scan_file, file_path)
+        first_category: Dict[str, str] = {}
+        for term_info in terms:
+            first_category.setdefault(term_info.term, term_info.category)
+        resolved = await self._resolve_all([(term, category) for term, category in first_category.items()])
+        links = {term: resolved[(term, category)] for term, category in first_category.items()}
+        return self.linker._build_file_index(file_path, terms, links)
+
+    async def aprocess_directory(self, dir_path: Path, output_dir: Optional[Path] = None,
+                                 index_format: str = "sqlite", max_files: int = 8) -> Dict:
+        """
+        Async AutoLinker.process_directory. Up to max_files files are indexed
+        concurrently; results are merged in file order, so the output matches
+        the sync run.
+        """
+        linker = self.linker
+        master_index = linker._new_master_index(dir_path)
+        store = linker._open_index_store(output_dir, index_format)
+
+        md_files = sorted(dir_path.rglob("*.md"))
+        linker.log(f"\nProcessing {len(md_files)} markdown files...")
+
+        file_slots = asyncio.Semaphore(max(1, max_files))
+
+        async def index_file(file_path: Path) -> Dict:
+            async with file_slots:
+                return await self.agenerate_link_index(file_path)
+
+        # Buffer cache saves like batch_cache_writes(), but flush off the event loop
+        fetcher = linker.fetcher
+        previous_batch_size = fetcher.cache_batch_size
+        fetcher.cache_batch_size = 50
+
+        tasks = [asyncio.ensure_future(index_file(file_path)) for file_path in md_files]
+        try:
+            for file_path, task in zip(md_files, tasks):
+                file_index = await task
+                linker.log(f"\n--- {file_path.name} ---")
+                linker._merge_file_index(master_index, file_index, store)
+
+            if store:
+                linker._finish_index_store(master_index, store)
+        except BaseException:
+            # Failed or cancelled: never publish a partial index
+            if store:
+                store.discard()
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+            fetcher.cache_batch_size = previous_batch_size
+            await asyncio.to_thread(fetcher.flush)
+
+        if store:
+            store.close()
+        await asyncio.to_thread(linker._save_master_index, master_index, store, output_dir)
+        return master_index
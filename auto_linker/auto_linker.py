@@ -14,29 +14,51 @@ Hierarchy:
 Usage:
     python auto_linker.py scan <file.md>           # Scan and show terms
     python auto_linker.py link <file.md>           # Generate linked version
+    python auto_linker.py link <dir> -o <outdir>   # Link every markdown file in a directory
     python auto_linker.py lookup "Term Name"       # Look up a single term
+    python auto_linker.py lookup --batch terms.txt # Look up many terms, streaming JSONL
     python auto_linker.py index <directory>        # Generate link index for directory
+    python auto_linker.py index <dir> -o <out> --resume  # Continue an interrupted index run
+    python auto_linker.py query <index> --term T   # Which files mention a term?
+    python auto_linker.py stats                    # Show source hit rates and ordering
+    python auto_linker.py build-table              # Prebuild links for the curated lexicon
+    python auto_linker.py estimate <directory>     # Predict a run's network cost offline
 """
 
+import os
+import re
+import stat
 import sys
 import argparse
 import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import asdict
 
 from config import KNOWN_TERMS, GLOSSARY_TERMS, OUTPUT_SETTINGS
+from cost_estimator import CostEstimator
 from term_scanner import TermScanner, FoundTerm
+from markdown_segmenter import mask_non_prose
+from background_resolver import BackgroundResolver
+from checkpoint import IndexCheckpoint
 from link_fetcher import LinkFetcher
+from link_index import LinkIndex
+from static_table import curated_terms
+from tracing import Tracer, profile_call
 
 
 class AutoLinker:
     """Main auto-linker class that ties scanning and fetching together."""
 
-    def __init__(self, verbose: bool = True):
-        self.scanner = TermScanner()
-        self.fetcher = LinkFetcher()
+    def __init__(self, verbose: bool = True, tracer: Optional[Tracer] = None):
+        self.tracer = tracer or Tracer()
+        self.scanner = TermScanner(tracer=self.tracer)
+        self.fetcher = LinkFetcher(tracer=self.tracer, verbose=verbose)
         self.verbose = verbose
+        self._background: Optional[BackgroundResolver] = None
 
     def log(self, message: str):
         """Print if verbose mode is on."""
@@ -55,7 +77,10 @@ class AutoLinker:
         self.log(f"\nLooking up: {term}" + (f" ({category})" if category else ""))
 
         url, source = self.fetcher.get_link(term, category)
+        return self._lookup_result(term, category, url, source)
 
+    def _lookup_result(self, term: str, category: Optional[str], url: Optional[str], source: str) -> Dict:
+        """Build the lookup_term result dict for a resolved term."""
         result = {
             "term": term,
             "category": category,
@@ -73,37 +98,140 @@ class AutoLinker:
 
         return result
 
-    def generate_linked_text(self, text: str, link_all: bool = False) -> str:
+    def lookup_terms(self, items: Iterable[Tuple[str, Optional[str]]], workers: int = 8,
+                     ordered: bool = False, cache_batch_size: int = 50) -> Iterator[Dict]:
+        """
+        Resolve many (term, category) pairs concurrently.
+
+        Duplicate pairs are resolved once. Results are yielded as lookups
+        complete (or in input order when ordered is set), each tagged with
+        its input "index". Cache writes are buffered in batches.
+        """
+        keys = list(items)
+
+        def resolve(term: str, category: Optional[str]) -> Dict:
+            try:
+                return self.lookup_term(term, category)
+            except Exception as e:
+                return {"term": term, "category": category, "url": None,
+                        "source": "", "found": False, "error": str(e)}
+
+        with self.fetcher.batch_cache_writes(cache_batch_size), \
+                ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {}
+            for key in keys:
+                if key not in futures:
+                    futures[key] = pool.submit(resolve, *key)
+
+            if ordered:
+                for index, key in enumerate(keys):
+                    yield {"index": index, **futures[key].result()}
+                return
+
+            indexes_by_key: Dict[Tuple[str, Optional[str]], List[int]] = {}
+            for index, key in enumerate(keys):
+                indexes_by_key.setdefault(key, []).append(index)
+            key_by_future = {future: key for key, future in futures.items()}
+
+            for future in as_completed(key_by_future):
+                for index in indexes_by_key[key_by_future[future]]:
+                    yield {"index": index, **future.result()}
+
+    def generate_linked_text(self, text: str, link_all: bool = False,
+                             link_format: Optional[str] = None) -> str:
         """
         Take text and return it with terms linked.
 
         Args:
             text: The source text
             link_all: If True, link all found terms. If False, only link known terms.
+            link_format: markdown, html, or plain (defaults to OUTPUT_SETTINGS["link_format"])
         """
-        terms = self.scanner.scan_text(text)
-        self.log(f"Found {len(terms)} potential terms to link")
+        link_format = link_format or OUTPUT_SETTINGS.get("link_format", "markdown")
+        terms = self._linkable_terms(text, link_all)
+        links = {(t.term, t.category): self.fetcher.get_link(t.term, t.category) for t in terms}
+        return self._apply_links(text, terms, links, link_format)
 
-        # Sort by position (reverse) so we can replace without messing up indices
-        # We need to find the actual positions for replacement
-        import re
+    def generate_linked_text_within(self, text: str, deadline: float, link_all: bool = False,
+                                    link_format: Optional[str] = None) -> Tuple[str, List[str]]:
+        """
+        Link text within a wall-clock budget of deadline seconds.
 
-        replacements = []
+        Terms answerable from the static table or cache are linked right away;
+        the rest are queued on the background resolver and linked only if they
+        finish before the deadline. Returns (linked_text, deferred_terms).
+        Deferred terms keep resolving in the background, so a later call picks
+        them up.
+        """
+        started = time.perf_counter()
+        link_format = link_format or OUTPUT_SETTINGS.get("link_format", "markdown")
+        terms = self._linkable_terms(text, link_all)
 
+        links = {}
+        waiting = {}
         for term_info in terms:
-            term = term_info.term
-
-            # Skip unknown terms unless link_all is set
-            if not link_all and term_info.category == "unknown":
+            key = (term_info.term, term_info.category)
+            if key in links or key in waiting:
                 continue
+            local = self.background.local_result(*key)
+            if local is not None:
+                links[key] = local
+            else:
+                waiting[key] = self.background.submit(*key)
 
-            # Look up the link
-            url, source = self.fetcher.get_link(term, term_info.category)
+        if waiting:
+            remaining = deadline - (time.perf_counter() - started)
+            wait(list(waiting.values()), timeout=max(0.0, remaining))
+
+        deferred = []
+        for key, future in waiting.items():
+            if future.done() and future.exception() is None:
+                links[key] = future.result()
+            else:
+                deferred.append(key[0])
+
+        if deferred:
+            self.log(f"Deferred {len(deferred)} terms to background resolution")
+        return self._apply_links(text, terms, links, link_format), deferred
+
+    @property
+    def background(self) -> BackgroundResolver:
+        """Background resolver used by deadline-bounded linking (created on first use)."""
+        if self._background is None:
+            self._background = BackgroundResolver(self.fetcher)
+        return self._background
+
+    def _linkable_terms(self, text: str, link_all: bool) -> List[FoundTerm]:
+        """Scan text and keep the terms generate_linked_text should try to link."""
+        with self.tracer.span("scan_text", chars=len(text)):
+            terms = self.scanner.scan_text(text)
+        self.log(f"Found {len(terms)} potential terms to link")
+
+        # Skip unknown terms unless link_all is set
+        return [t for t in terms if link_all or t.category != "unknown"]
+
+    def _apply_links(self, text: str, terms: List[FoundTerm],
+                     links: Dict[Tuple[str, str], Tuple[Optional[str], str]], link_format: str) -> str:
+        """
+        Insert links for resolved terms into text.
+
+        links maps (term, category) to (url, source); terms without an entry
+        or without a url are left unlinked.
+        """
+        replacements = []
+
+        # Only insert links into prose - never inside code, URLs, HTML or math
+        search_text = mask_non_prose(text) if self.scanner.markdown_aware else text
+
+        for term_info in terms:
+            # Link the spelling the document uses, which may be a variant of the term
+            term = term_info.surface or term_info.term
+            url, source = links.get((term_info.term, term_info.category), (None, ""))
 
             if url:
                 # Find all occurrences of this term in text
                 pattern = re.compile(r'\b' + re.escape(term) + r'\b')
-                for match in pattern.finditer(text):
+                for match in pattern.finditer(search_text):
                     # Don't replace if already in a markdown link
                     before = text[max(0, match.start() - 2):match.start()]
                     after = text[match.end():min(len(text), match.end() + 2)]
@@ -114,7 +242,7 @@ class AutoLinker:
                         "start": match.start(),
                         "end": match.end(),
                         "original": term,
-                        "replacement": self.fetcher.format_link(term, url, source, "markdown")
+                        "replacement": self.fetcher.format_link(term, url, source, link_format)
                     })
                     break  # Only replace first occurrence
 
@@ -127,12 +255,100 @@ class AutoLinker:
 
         return result
 
+    def link_file(self, file_path: Path, output_path: Path, link_all: bool = False,
+                  link_format: Optional[str] = None) -> bool:
+        """
+        Link a single file and write the result to output_path.
+        Returns True if the output was written, False if it was already up to date.
+        """
+        with self.tracer.span("link_file", category="file", path=str(file_path)):
+            with self.tracer.span("read_file", path=str(file_path)):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+
+            linked_text = self.generate_linked_text(text, link_all=link_all, link_format=link_format)
+
+            with self.tracer.span("write_output", category="io", path=str(output_path)):
+                return write_if_changed(output_path, linked_text)
+
+    def link_directory(self, dir_path: Path, output_dir: Optional[Path] = None,
+                       in_place: bool = False, link_all: bool = False,
+                       link_format: Optional[str] = None, workers: int = 4) -> Dict:
+        """
+        Link every markdown file in a directory over a worker pool.
+
+        Output mirrors the source tree under output_dir, or overwrites the
+        sources when in_place is set. Files whose linked output is unchanged
+        are not rewritten, so their mtimes stay untouched.
+        """
+        if not in_place and output_dir is None:
+            raise ValueError("Either output_dir or in_place is required")
+
+        md_files = sorted(dir_path.rglob("*.md"))
+        if output_dir is not None and not in_place:
+            # Don't re-link our own output when it lives inside the source tree
+            output_root = output_dir.resolve()
+            md_files = [p for p in md_files if output_root not in p.resolve().parents]
+
+        self.log(f"\nLinking {len(md_files)} markdown files with {workers} workers...")
+
+        summary = {
+            "source_directory": str(dir_path),
+            "files_processed": 0,
+            "files_written": 0,
+            "files_unchanged": 0,
+            "errors": {}
+        }
+
+        def target_for(file_path: Path) -> Path:
+            if in_place:
+                return file_path
+            return output_dir / file_path.relative_to(dir_path)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                pool.submit(self.link_file, file_path, target_for(file_path),
+                            link_all, link_format): file_path
+                for file_path in md_files
+            }
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    written = future.result()
+                except Exception as e:
+                    summary["errors"][str(file_path)] = str(e)
+                    self.log(f"Error linking {file_path}: {e}")
+                    continue
+
+                summary["files_processed"] += 1
+                if written:
+                    summary["files_written"] += 1
+                    self.log(f"Wrote: {target_for(file_path)}")
+                else:
+                    summary["files_unchanged"] += 1
+
+        return summary
+
     def generate_link_index(self, file_path: Path) -> Dict:
         """
         Generate a link index for a file - a JSON mapping of terms to their links.
         """
-        terms = self.scan_file(file_path)
+        with self.tracer.span("index_file", category="file", path=str(file_path)):
+            return self._generate_link_index(file_path)
 
+    def _generate_link_index(self, file_path: Path) -> Dict:
+        """generate_link_index without the trace span."""
+        terms = self.scan_file(file_path)
+        links = {}
+        for term_info in terms:
+            # Skip if already resolved
+            if term_info.term not in links:
+                links[term_info.term] = self.fetcher.get_link(term_info.term, term_info.category)
+        return self._build_file_index(file_path, terms, links)
+
+    def _build_file_index(self, file_path: Path, terms: List[FoundTerm],
+                          links: Dict[str, Tuple[Optional[str], str]]) -> Dict:
+        """Assemble a file's link index from its terms and their resolved links."""
         index = {
             "source_file": str(file_path),
             "total_terms": len(terms),
@@ -147,7 +363,7 @@ class AutoLinker:
             if term in index["terms"]:
                 continue
 
-            url, source = self.fetcher.get_link(term, term_info.category)
+            url, source = links[term]
 
             if url:
                 index["terms"][term] = {
@@ -168,12 +384,124 @@ class AutoLinker:
 
         return index
 
-    def process_directory(self, dir_path: Path, output_dir: Optional[Path] = None) -> Dict:
+    def process_directory(self, dir_path: Path, output_dir: Optional[Path] = None,
+                          index_format: str = "sqlite", resume: bool = False) -> Dict:
         """
         Process all markdown files in a directory.
         Returns a master index of all terms found.
+
+        With index_format "sqlite", each file's terms are streamed into
+        output_dir/link_index.db as it is processed and the returned index
+        carries no per-term "found_in" lists - query the database instead.
+        "json" keeps the legacy single link_index.json document.
+
+        With an output_dir, finished files are checkpointed as the run goes.
+        resume reuses the file indexes from an interrupted run's checkpoint
+        (for files whose contents haven't changed since) and processes the
+        rest, giving the same index as an uninterrupted run. Resuming is
+        refused if files were added or removed in the meantime.
+        """
+        master_index = self._new_master_index(dir_path)
+        md_files = sorted(dir_path.rglob("*.md"))
+
+        checkpoint = None
+        completed: Dict[str, Dict] = {}
+        if output_dir:
+            checkpoint = IndexCheckpoint.for_output(
+                output_dir,
+                interval_files=OUTPUT_SETTINGS.get("checkpoint_every_files", 10),
+                interval_seconds=OUTPUT_SETTINGS.get("checkpoint_every_seconds", 30.0)
+            )
+            header = {
+                "source_directory": str(dir_path),
+                "index_format": index_format,
+                "files": [str(p) for p in md_files],
+            }
+            if resume:
+                completed = self._load_checkpoint(checkpoint, header)
+            checkpoint.start(header, list(completed.values()))
+        elif resume:
+            raise ValueError("resuming needs the output directory of the interrupted run")
+
+        store = self._open_index_store(output_dir, index_format)
+
+        self.log(f"\nProcessing {len(md_files)} markdown files...")
+        if completed:
+            self.log(f"Resuming: {len(completed)} file(s) already done")
+
+        try:
+            for file_path in md_files:
+                record = completed.get(str(file_path))
+                if record is not None and record["stat"] == self._file_stat(file_path):
+                    file_index = record["index"]
+                else:
+                    self.log(f"\n--- {file_path.name} ---")
+                    stat_before = self._file_stat(file_path)
+                    file_index = self.generate_link_index(file_path)
+                    if checkpoint:
+                        checkpoint.record({"stat": stat_before, "index": file_index})
+                self._merge_file_index(master_index, file_index, store)
+
+            if store:
+                self._finish_index_store(master_index, store)
+        except BaseException:
+            # Keep the checkpoint for --resume; never publish a partial index
+            if checkpoint:
+                checkpoint.close()
+                self.log(f"\nRun interrupted; progress saved to {checkpoint.path} (continue with --resume)")
+            if store:
+                store.discard()
+            raise
+
+        if store:
+            store.close()
+        self._save_master_index(master_index, store, output_dir)
+        if checkpoint:
+            checkpoint.remove()
+        return master_index
+
+    def _file_stat(self, file_path: Path) -> List[int]:
+        """Size and mtime, to tell whether a checkpointed file has changed since."""
+        st = file_path.stat()
+        return [st.st_size, st.st_mtime_ns]
+
+    def _load_checkpoint(self, checkpoint: IndexCheckpoint, header: Dict) -> Dict[str, Dict]:
+        """Checkpointed file records by path, or {} if there is nothing to resume."""
+        loaded = checkpoint.load()
+        if loaded is None:
+            self.log("No checkpoint found; starting from the beginning")
+            return {}
+
+        saved_header, records = loaded
+        if saved_header.get("files") != header["files"]:
+            added = len(set(header["files"]) - set(saved_header.get("files") or []))
+            removed = len(set(saved_header.get("files") or []) - set(header["files"]))
+            raise ValueError(
+                f"markdown files changed since {checkpoint.path} was written "
+                f"({added} added, {removed} removed); rerun without --resume"
+            )
+        for key, value in header.items():
+            if key != "files" and saved_header.get(key) != value:
+                raise ValueError(
+                    f"{checkpoint.path} belongs to a different run "
+                    f"({key}: {saved_header.get(key)!r}, not {value!r}); rerun without --resume"
+                )
+        return {record["index"]["source_file"]: record for record in records}
+
+    def estimate_cost(self, path: Path, mode: str = "index", link_all: bool = False,
+                      workers: int = 1) -> Dict:
         """
-        master_index = {
+        Predict the requests, bytes and wall time an index or link run over
+        path would cost, without any network I/O.
+        """
+        files = [path] if path.is_file() else sorted(path.rglob("*.md"))
+        return CostEstimator(self.scanner, self.fetcher).estimate_files(
+            files, mode=mode, link_all=link_all, workers=workers
+        )
+
+    def _new_master_index(self, dir_path: Path) -> Dict:
+        """Empty master index for a directory run."""
+        return {
             "source_directory": str(dir_path),
             "files_processed": 0,
             "total_terms": 0,
@@ -181,71 +509,181 @@ class AutoLinker:
             "terms": {}
         }
 
-        md_files = list(dir_path.rglob("*.md"))
-        self.log(f"\nProcessing {len(md_files)} markdown files...")
-
-        for file_path in md_files:
-            self.log(f"\n--- {file_path.name} ---")
-            file_index = self.generate_link_index(file_path)
-
-            master_index["files_processed"] += 1
-            master_index["total_terms"] += file_index["total_terms"]
-            master_index["linked_terms"] += file_index["linked_terms"]
-
-            # Merge terms
-            for term, info in file_index["terms"].items():
-                if term not in master_index["terms"]:
-                    master_index["terms"][term] = info
-                    master_index["terms"][term]["found_in"] = [str(file_path)]
-                else:
-                    if "found_in" in master_index["terms"][term]:
-                        master_index["terms"][term]["found_in"].append(str(file_path))
-
-        if output_dir:
+    def _open_index_store(self, output_dir: Optional[Path], index_format: str) -> Optional[LinkIndex]:
+        """Start a SQLite index for streaming writes, if one was asked for."""
+        if output_dir and index_format == "sqlite":
+            return LinkIndex.create(output_dir)
+        return None
+
+    def _merge_file_index(self, master_index: Dict, file_index: Dict, store: Optional[LinkIndex]):
+        """Fold one file's index into the master index (and stream it to the store)."""
+        file_path = file_index["source_file"]
+
+        master_index["files_processed"] += 1
+        master_index["total_terms"] += file_index["total_terms"]
+        master_index["linked_terms"] += file_index["linked_terms"]
+
+        if store:
+            with self.tracer.span("write_index", category="io", path=file_path):
+                store.add_file_index(file_index)
+
+        # Merge terms
+        for term, info in file_index["terms"].items():
+            if term not in master_index["terms"]:
+                master_index["terms"][term] = info
+                if not store:
+                    master_index["terms"][term]["found_in"] = [file_path]
+            else:
+                if "found_in" in master_index["terms"][term]:
+                    master_index["terms"][term]["found_in"].append(file_path)
+
+    def _finish_index_store(self, master_index: Dict, store: LinkIndex):
+        """Record run-level totals in the store."""
+        store.set_meta(
+            source_directory=master_index["source_directory"],
+            files_processed=master_index["files_processed"],
+            total_terms=master_index["total_terms"],
+            linked_terms=master_index["linked_terms"]
+        )
+
+    def _save_master_index(self, master_index: Dict, store: Optional[LinkIndex], output_dir: Optional[Path]):
+        """Report the SQLite index, or write the legacy JSON index."""
+        if store:
+            self.log(f"\nIndex saved to: {store.db_path}")
+        elif output_dir:
+            output_dir.mkdir(parents=True, exist_ok=True)
             output_file = output_dir / "link_index.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(master_index, f, indent=2)
+            with self.tracer.span("write_index", category="io", path=str(output_file)):
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(master_index, f, indent=2)
             self.log(f"\nIndex saved to: {output_file}")
 
-        return master_index
-
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Theophysics Auto-Linker - Link terms to academic sources"
-    )
-
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
-
-    # Scan command
-    scan_parser = subparsers.add_parser("scan", help="Scan a file for terms")
-    scan_parser.add_argument("file", type=Path, help="File to scan")
-    scan_parser.add_argument("--json", action="store_true", help="Output as JSON")
-
-    # Link command
-    link_parser = subparsers.add_parser("link", help="Generate linked version of file")
-    link_parser.add_argument("file", type=Path, help="File to process")
-    link_parser.add_argument("-o", "--output", type=Path, help="Output file")
-    link_parser.add_argument("--all", action="store_true", help="Link all found terms")
-
-    # Lookup command
-    lookup_parser = subparsers.add_parser("lookup", help="Look up a single term")
-    lookup_parser.add_argument("term", help="Term to look up")
-    lookup_parser.add_argument("-c", "--category", help="Term category hint")
-
-    # Index command
-    index_parser = subparsers.add_parser("index", help="Generate link index")
-    index_parser.add_argument("path", type=Path, help="File or directory to index")
-    index_parser.add_argument("-o", "--output", type=Path, help="Output directory")
+def read_batch_terms(lines: Iterable[str], default_category: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+    """
+    Parse batch lookup input: plain term lines, or JSONL objects with a
+    "term" and an optional "category". Blank lines are skipped.
+    """
+    items = []
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                entry = json.loads(line)
+                items.append((entry["term"], entry.get("category") or default_category))
+            except (ValueError, KeyError) as e:
+                raise ValueError(f"Bad batch line {line_number}: {e}")
+        else:
+            items.append((line, default_category))
+    return items
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """
+    Atomically write text to path via a temp file in the same directory.
+    Skips the write (and leaves the mtime alone) when the bytes are identical.
+    Returns True if the file was written.
+    """
+    data = text.encode('utf-8')
+    existed = path.exists()
+    if existed and path.read_bytes() == data:
+        return False
+    # mkstemp creates files 0600; keep the original mode or use a normal default
+    mode = stat.S_IMODE(path.stat().st_mode) if existed else 0o644
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return True
+
+
+def print_estimate(report: Dict, top: int = 10):
+    """Print a cost estimate from AutoLinker.estimate_cost."""
+    print(f"\n{'='*60}")
+    print(f"COST ESTIMATE ({report['mode']} run, no network used)")
+    print(f"{'='*60}")
+    print(f"Files: {report['files']}")
+    print(f"Term occurrences: {report['term_occurrences']}")
+    print(f"Unique terms: {report['unique_terms']}")
+    print(f"  Cache hits: {report['cache_hits']}")
+    print(f"  Known misses: {report['known_misses']}")
+    print(f"  Unresolved: {report['unresolved']}")
+    print(f"Expected requests: {report['expected_requests']:.0f} (at most {report['max_requests']})")
+    print(f"Expected transfer: {report['expected_bytes'] / 1024:.0f} KB")
+    print(f"Expected time: {report['expected_seconds']:.0f}s sequential", end="")
+    if report["workers"] > 1:
+        print(f", ~{report['expected_seconds_parallel']:.0f}s with {report['workers']} workers")
+    else:
+        print()
 
-    args = parser.parse_args()
+    if report["terms"][:top]:
+        print(f"\nCostliest unresolved terms:")
+        for entry in report["terms"][:top]:
+            print(f"  [{entry['category']}] {entry['term']}: ~{entry['expected_requests']:.1f} requests, "
+                  f"~{entry['expected_seconds']:.1f}s ({' > '.join(entry['source_order'])})")
+
+
+def run_command(args: argparse.Namespace, parser: argparse.ArgumentParser):
+    """Dispatch a parsed command line."""
+    if args.command == "query":
+        # Queries never touch the network, so skip building a linker
+        with LinkIndex.open(args.index) as store:
+            if args.term:
+                info = store.lookup_term(args.term)
+                result = {"term": args.term, "link": info, "files": store.files_for_term(args.term)}
+            else:
+                try:
+                    matched, terms = store.terms_for_file(args.file)
+                except ValueError as e:
+                    parser.error(str(e))
+                result = {"file": matched or args.file, "terms": terms}
 
-    if not args.command:
-        parser.print_help()
+        if args.json:
+            print(json.dumps(result, indent=2))
+        elif args.term:
+            info = result["link"]
+            if info is None:
+                print(f"'{args.term}' is not in the index")
+            else:
+                print(f"{info['term']}: {info['url'] or 'no link'}" + (f" [{info['source']}]" if info["source"] else ""))
+                print(f"Found in {len(result['files'])} file(s):")
+                for path in result["files"]:
+                    print(f"  {path}")
+        else:
+            print(f"{len(result['terms'])} term(s) in {result['file']}:")
+            for term in result["terms"]:
+                print(f"  [{term['category']}] {term['term']}: {term['url'] or 'no link'}")
         return
 
-    linker = AutoLinker()
-
+    if args.command == "lookup" and not args.term and not args.batch:
+        parser.error("lookup requires a term or --batch")
+
+    # Batch lookups stream JSONL on stdout, so keep progress chatter off it
+    batch_lookup = args.command == "lookup" and args.batch is not None
+    linker = AutoLinker(verbose=not batch_lookup, tracer=Tracer(enabled=args.trace is not None))
+    try:
+        run_linker_command(linker, args, parser)
+    finally:
+        if args.trace:
+            linker.tracer.save(args.trace)
+            print(f"\nTrace saved to: {args.trace}")
+            print("Time by phase:")
+            for name, totals in linker.tracer.summary().items():
+                print(f"  {name:<14} {totals['count']:6d} spans  {totals['total_ms']:10.1f} ms")
+
+
+def run_linker_command(linker: AutoLinker, args: argparse.Namespace, parser: argparse.ArgumentParser):
+    """Run a command that needs an AutoLinker."""
     if args.command == "scan":
         terms = linker.scan_file(args.file)
 
@@ -263,20 +701,140 @@ def main():
                 print(f"    Proper noun: {term.is_proper_noun}")
                 print()
 
+    elif args.command == "estimate" or getattr(args, "dry_run", False):
+        mode = args.mode if args.command == "estimate" else args.command
+        path = args.file if args.command == "link" else args.path
+        workers = args.workers if mode == "link" else 1
+        report = linker.estimate_cost(path, mode=mode, link_all=getattr(args, "all", False), workers=workers)
+
+        if getattr(args, "json", False):
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            print_estimate(report)
+
     elif args.command == "link":
-        with open(args.file, 'r', encoding='utf-8') as f:
-            text = f.read()
+        if args.file.is_dir():
+            if args.deadline is not None:
+                parser.error("--deadline applies to single files")
+            if not args.output and not args.in_place:
+                parser.error("linking a directory requires -o/--output or --in-place")
 
-        linked_text = linker.generate_linked_text(text, link_all=args.all)
+            summary = linker.link_directory(
+                args.file, args.output, in_place=args.in_place,
+                link_all=args.all, link_format=args.format, workers=args.workers
+            )
 
-        if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(linked_text)
-            print(f"Linked version saved to: {args.output}")
+            print(f"\n{'='*60}")
+            print("LINK SUMMARY")
+            print(f"{'='*60}")
+            print(f"Files processed: {summary['files_processed']}")
+            print(f"Files written: {summary['files_written']}")
+            print(f"Files unchanged: {summary['files_unchanged']}")
+            if summary["errors"]:
+                print(f"Errors: {len(summary['errors'])}")
+                for file_name, error in summary["errors"].items():
+                    print(f"  {file_name}: {error}")
+            return
+
+        if args.deadline is not None:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                text = f.read()
+            linked_text, deferred = linker.generate_linked_text_within(
+                text, args.deadline, link_all=args.all, link_format=args.format
+            )
+
+            output = args.file if args.in_place else args.output
+            if output:
+                write_if_changed(output, linked_text)
+                print(f"Linked version saved to: {output}")
+            else:
+                print(linked_text)
+
+            if deferred:
+                print(f"Deferred terms ({len(deferred)}): {', '.join(deferred)}", file=sys.stderr)
+                print("Resolving deferred terms in the background for the next run...", file=sys.stderr)
+                linker.background.shutdown(wait=True)
+                linker.fetcher.flush()
+            return
+
+        output = args.file if args.in_place else args.output
+
+        if output:
+            written = linker.link_file(args.file, output, link_all=args.all,
+                                       link_format=args.format)
+            if written:
+                print(f"Linked version saved to: {output}")
+            else:
+                print(f"Already up to date: {output}")
         else:
-            print(linked_text)
+            with open(args.file, 'r', encoding='utf-8') as f:
+                text = f.read()
+            print(linker.generate_linked_text(text, link_all=args.all, link_format=args.format))
+
+    elif args.command in ("build-table", "warm"):
+        table = linker.fetcher.static_table
+        terms = curated_terms()
+        refresh = args.refresh
+
+        if args.terms:
+            by_name = dict(terms)
+            unknown = [t for t in args.terms if t not in by_name]
+            if unknown:
+                parser.error(f"not in KNOWN_TERMS or GLOSSARY_TERMS: {', '.join(unknown)}")
+            terms = [(t, by_name[t]) for t in args.terms]
+            refresh = True  # Naming a term means refreshing it
+
+        try:
+            counts = table.build(linker.fetcher, terms, refresh=refresh, log=linker.log)
+        finally:
+            table.save()
+
+        print(f"\n{'='*60}")
+        print("STATIC LINK TABLE")
+        print(f"{'='*60}")
+        print(f"Table: {table.path} ({len(table)} entries)")
+        print(f"Resolved: {counts['resolved']} ({counts['linked']} linked)")
+        print(f"Skipped (already in table): {counts['skipped']}")
+
+    elif args.command == "stats":
+        stats = linker.fetcher.source_stats
+        report = stats.report()
+
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return
+
+        if not report:
+            print("No source statistics recorded yet.")
+            return
+
+        for category, sources in report.items():
+            print(f"\n[{category}]")
+            for source, entry in sources.items():
+                hit_rate = f"{entry['hit_rate']:.0%}" if entry["hit_rate"] is not None else "-"
+                latency = f"{entry['mean_seconds']:.2f}s" if entry["mean_seconds"] is not None else "-"
+                print(f"  {source:<14} {entry['attempts']:6d} probes  {hit_rate:>5} hits  {latency:>7} avg")
+            configured = linker.fetcher.configured_source_order(None if category == "any" else category)
+            if linker.fetcher.is_strict("", category):
+                print(f"  Strict order: {' > '.join(configured)}")
+            else:
+                print(f"  Adaptive order: {' > '.join(stats.order(category, configured))}")
 
     elif args.command == "lookup":
+        if args.batch:
+            try:
+                if args.batch == "-":
+                    items = read_batch_terms(sys.stdin, args.category)
+                else:
+                    with open(args.batch, 'r', encoding='utf-8') as f:
+                        items = read_batch_terms(f, args.category)
+            except ValueError as e:
+                parser.error(str(e))
+
+            for result in linker.lookup_terms(items, workers=args.workers, ordered=args.ordered):
+                print(json.dumps(result, ensure_ascii=False), flush=True)
+            return
+
         result = linker.lookup_term(args.term, args.category)
         print(json.dumps(result, indent=2))
 
@@ -286,7 +844,13 @@ def main():
         if path.is_file():
             index = linker.generate_link_index(path)
         else:
-            index = linker.process_directory(path, args.output)
+            if args.resume and not args.output:
+                parser.error("--resume needs the -o/--output directory of the interrupted run")
+            try:
+                index = linker.process_directory(path, args.output, index_format=args.index_format,
+                                                 resume=args.resume)
+            except ValueError as e:
+                parser.error(str(e))
 
         print(f"\n{'='*60}")
         print("LINK INDEX SUMMARY")
@@ -306,5 +870,111 @@ def main():
                 print(f"    {info.get('url')}")
 
 
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Theophysics Auto-Linker - Link terms to academic sources"
+    )
+
+    parser.add_argument("--trace", type=Path, metavar="FILE",
+                        help="Write a Chrome trace-event / Perfetto timeline of the run to FILE")
+    parser.add_argument("--profile", type=Path, metavar="FILE",
+                        help="Run under cProfile and tracemalloc and write a hotspot report to FILE")
+
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+
+    # Scan command
+    scan_parser = subparsers.add_parser("scan", help="Scan a file for terms")
+    scan_parser.add_argument("file", type=Path, help="File to scan")
+    scan_parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    # Link command
+    link_parser = subparsers.add_parser("link", help="Generate linked version of file or directory")
+    link_parser.add_argument("file", type=Path, help="File or directory to process")
+    link_parser.add_argument("-o", "--output", type=Path,
+                             help="Output file (or output directory when linking a directory)")
+    link_parser.add_argument("--in-place", action="store_true",
+                             help="Overwrite the source file(s) with the linked version")
+    link_parser.add_argument("--all", action="store_true", help="Link all found terms")
+    link_parser.add_argument("--format", choices=["markdown", "html", "plain"],
+                             default=OUTPUT_SETTINGS.get("link_format", "markdown"),
+                             help="Link output format")
+    link_parser.add_argument("-j", "--workers", type=int, default=4,
+                             help="Worker threads for directory runs")
+    link_parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                             help="Single file: return within SECONDS, linking only what resolves in time; "
+                                  "the rest keeps resolving in the background")
+    link_parser.add_argument("--dry-run", action="store_true",
+                             help="Estimate requests, bytes and time for this run without linking anything")
+
+    # Lookup command
+    lookup_parser = subparsers.add_parser("lookup", help="Look up a single term or a batch of terms")
+    lookup_parser.add_argument("term", nargs="?", help="Term to look up")
+    lookup_parser.add_argument("-c", "--category", help="Term category hint (default for --batch lines)")
+    lookup_parser.add_argument("--batch", metavar="FILE",
+                               help="Read terms from FILE ('-' for stdin): one per line, or JSONL "
+                                    "objects with \"term\" and optional \"category\"; streams JSONL results")
+    lookup_parser.add_argument("--ordered", action="store_true",
+                               help="With --batch, emit results in input order instead of as they complete")
+    lookup_parser.add_argument("-j", "--workers", type=int, default=8,
+                               help="Concurrent lookups for --batch")
+
+    # Index command
+    index_parser = subparsers.add_parser("index", help="Generate link index")
+    index_parser.add_argument("path", type=Path, help="File or directory to index")
+    index_parser.add_argument("-o", "--output", type=Path, help="Output directory")
+    index_parser.add_argument("--index-format", choices=["sqlite", "json"], default="sqlite",
+                              help="sqlite (queryable link_index.db) or json (legacy link_index.json)")
+    index_parser.add_argument("--resume", action="store_true",
+                              help="Continue an interrupted directory run from its checkpoint in the output directory")
+    index_parser.add_argument("--dry-run", action="store_true",
+                              help="Estimate requests, bytes and time for this run without indexing anything")
+
+    # Build-table command
+    table_parser = subparsers.add_parser(
+        "build-table", aliases=["warm"],
+        help="Resolve the curated lexicon into the static link table shipped with the package"
+    )
+    table_parser.add_argument("-t", "--term", action="append", dest="terms", metavar="TERM",
+                              help="Only (re)resolve this curated term; repeatable")
+    table_parser.add_argument("--refresh", action="store_true",
+                              help="Re-resolve terms that are already in the table")
+
+    # Estimate command
+    estimate_parser = subparsers.add_parser(
+        "estimate", help="Predict the network cost of an index or link run, without any network I/O"
+    )
+    estimate_parser.add_argument("path", type=Path, help="File or directory to estimate")
+    estimate_parser.add_argument("--mode", choices=["index", "link"], default="index",
+                                 help="Which run to estimate (link skips unknown terms unless --all)")
+    estimate_parser.add_argument("--all", action="store_true", help="With --mode link, count all found terms")
+    estimate_parser.add_argument("-j", "--workers", type=int, default=4,
+                                 help="With --mode link, worker count for the parallel time estimate")
+    estimate_parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    # Stats command
+    stats_parser = subparsers.add_parser("stats", help="Show per-category source hit rates and ordering")
+    stats_parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    # Query command
+    query_parser = subparsers.add_parser("query", help="Query a link index")
+    query_parser.add_argument("index", type=Path, help="link_index.db or the directory containing it")
+    query_group = query_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument("-t", "--term", help="List the files that mention a term")
+    query_group.add_argument("-f", "--file", help="List the terms found in a file")
+    query_parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return
+
+    if args.profile:
+        profile_call(lambda: run_command(args, parser), args.profile)
+    else:
+        run_command(args, parser)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,69 @@
+"""
+Background Resolver - Keeps resolving terms after a deadline has passed.
+
+Deadline-bounded linking (AutoLinker.generate_linked_text_within) hands every
+term it can't answer locally to this resolver, waits only as long as its
+budget allows, and returns. The resolver keeps working in the background;
+hits land in the fetcher's cache and misses are remembered here, so a later
+call picks up the finished results without any network I/O.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from link_fetcher import LinkFetcher
+
+Link = Tuple[Optional[str], str]
+
+
+class BackgroundResolver:
+    """Deduplicating background queue of get_link calls."""
+
+    def __init__(self, fetcher: LinkFetcher, workers: int = 4):
+        self.fetcher = fetcher
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="backfill")
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._misses: Dict[str, Link] = {}  # get_link doesn't cache misses
+
+    def _key(self, term: str, category: Optional[str]) -> str:
+        return self.fetcher.cache_key(term, category)  # Spelling variants share one lookup
+
+    def local_result(self, term: str, category: Optional[str]) -> Optional[Link]:
+        """A finished result (hit or miss) available without I/O, or None."""
+        local = self.fetcher.local_link(term, category)
+        if local is not None:
+            return local
+        with self._lock:
+            return self._misses.get(self._key(term, category))
+
+    def submit(self, term: str, category: Optional[str]) -> Future:
+        """Queue a lookup, or return the one already queued for this term."""
+        key = self._key(term, category)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pool.submit(self._resolve, key, term, category)
+                self._pending[key] = future
+            return future
+
+    def _resolve(self, key: str, term: str, category: Optional[str]) -> Link:
+        try:
+            url, source = self.fetcher.get_link(term, category)
+            if not url:
+                with self._lock:
+                    self._misses[key] = (url, source)
+            return url, source
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def pending(self) -> int:
+        """Number of lookups still queued or running."""
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work; with wait, block until the queue drains."""
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,111 @@
+"""
+Checkpoint - Durable progress for long directory index runs.
+
+process_directory appends each finished file's index to a JSONL checkpoint
+next to the output, flushing it to disk every few files or seconds. The first
+line is a header naming the run (source directory, index format and the file
+list). `index --resume` refuses a checkpoint whose header doesn't match the
+current run, including a changed file list. Otherwise it replays the recorded
+file indexes without any network I/O and carries on with the files that are
+left, so the final index matches an uninterrupted run. The checkpoint is
+deleted once the run completes.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CHECKPOINT_FILE_NAME = "link_index.checkpoint.jsonl"
+CHECKPOINT_VERSION = 1
+
+
+class IndexCheckpoint:
+    """Append-only record of the files a directory index run has finished."""
+
+    def __init__(self, path: Path, interval_files: int = 10, interval_seconds: float = 30.0):
+        self.path = path
+        self.interval_files = interval_files
+        self.interval_seconds = interval_seconds
+        self._file = None
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def for_output(cls, output_dir: Path, **intervals) -> "IndexCheckpoint":
+        """The checkpoint belonging to an output directory."""
+        return cls(output_dir / CHECKPOINT_FILE_NAME, **intervals)
+
+    def load(self) -> Optional[Tuple[Dict, List[Dict]]]:
+        """
+        Read (header, file_indexes) from an existing checkpoint, or None if
+        there is none. A torn last line from a crash mid-write is dropped.
+        """
+        if not self.path.exists():
+            return None
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break  # Everything after a torn write is unreliable
+
+        if not records or records[0].get("version") != CHECKPOINT_VERSION:
+            return None
+        return records[0], records[1:]
+
+    def start(self, header: Dict, file_indexes: Optional[List[Dict]] = None):
+        """
+        Begin writing a checkpoint with header, rewriting it from scratch.
+        Already-completed file_indexes (when resuming) are carried over.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"version": CHECKPOINT_VERSION, **header}) + "\n")
+            for file_index in file_indexes or []:
+                f.write(json.dumps(file_index) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._last_flush = time.monotonic()
+
+    def record(self, file_index: Dict):
+        """Note a finished file; hits the disk once per interval."""
+        # Serialize now: the caller goes on to mutate the dict while merging
+        self._buffer.append(json.dumps(file_index) + "\n")
+        if (len(self._buffer) >= self.interval_files
+                or time.monotonic() - self._last_flush >= self.interval_seconds):
+            self.flush()
+
+    def flush(self):
+        """Write buffered records and fsync them."""
+        if self._file is None:
+            return
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush and close, keeping the checkpoint for a later --resume."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Close and delete the checkpoint once the run has finished."""
+        self._buffer.clear()
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
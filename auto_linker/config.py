@@ -86,6 +86,22 @@ TERM_CATEGORIES = {
     }
 }
 
+# Adaptive source ordering
+# The fetcher records hit rate and latency per category and source. Once a
+# category has enough history, sources are tried cheapest-expected-first and
+# sources that almost never hit are skipped. Strict categories and known
+# (curated) terms always use the configured order above.
+ADAPTIVE_ORDERING = {
+    "mode": "adaptive",  # adaptive or strict
+    "strict_categories": ["philosopher", "theological"],
+    "min_attempts": 20,  # Probes per source before a category is reordered
+    "skip_below_hit_rate": 0.02,  # Skip sources that hit less often than this...
+    "explore_every": 50,  # ...but still try a skipped source every Nth lookup, so it can recover
+    "history_limit": 200,  # Halve a source's counts past this many probes, so old results fade
+    "pinned_sources": ["PhilPapers", "arXiv"],  # Search-URL sources, never reordered
+    "probe_delay_seconds": 0.5,  # Politeness delay after each missed source (and part of its cost)
+}
+
 # Known proper nouns from the Theophysics lexicon
 # Pre-mapped for faster lookup
 KNOWN_TERMS = {
@@ -162,5 +178,9 @@ OUTPUT_SETTINGS = {
     "link_format": "markdown",  # markdown, html, or plain
     "include_source_badge": True,  # Add [SEP] or [Wiki] after links
     "cache_links": True,  # Cache successful lookups
-    "cache_file": "link_cache.json"
+    "cache_file": "link_cache.json",
+    "stats_file": "source_stats.json",  # Per-category source hit rates and latencies
+    "static_table_file": "static_links.json",  # Prebuilt links for the curated lexicon (build-table)
+    "checkpoint_every_files": 10,  # index -o: flush the resume checkpoint this often...
+    "checkpoint_every_seconds": 30.0  # ...or after this long, whichever comes first
 }
@@ -0,0 +1,151 @@
+"""
+Cost Estimator - Predicts the network cost of an index or link run offline.
+
+Scans the corpus the same way the real run would and classifies every unique
+(term, category) as a cache hit (static table or link cache), a known miss
+(curated term with no link) or unresolved. For unresolved terms it walks the
+source order get_link would use, counting the requests each source issues
+(including every SEP slug variant and the search page). It then weights them
+by the hit rates and latencies recorded in source_stats.json to report
+expected requests, bytes and wall time. Nothing touches the network.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from link_fetcher import LinkFetcher
+from term_scanner import TermScanner
+
+# Rough response sizes per request type, in bytes (headers included)
+PROBE_BYTES = 600  # HEAD probe; the ranged-GET fallback reads at most 4 KB
+SEP_SEARCH_BYTES = 60_000  # Streamed until the first entry link
+WIKIPEDIA_API_BYTES = 1_500  # Small JSON answers
+
+# Used until source_stats.json has history for a category/source
+DEFAULT_HIT_RATES = {
+    "SEP": 0.3,
+    "Scholarpedia": 0.2,
+    "IEP": 0.2,
+    "Wikipedia": 0.8,
+    "PhilPapers": 1.0,  # Search URLs always "hit"
+    "arXiv": 1.0,
+}
+DEFAULT_REQUEST_SECONDS = 0.3
+
+
+@dataclass
+class TermEstimate:
+    """Predicted cost of resolving one (term, category)."""
+    term: str
+    category: str
+    status: str  # cache_hit, known_miss or unresolved
+    files: int = 1
+    source_order: List[str] = field(default_factory=list)
+    max_requests: int = 0  # If every source misses, in every file
+    expected_requests: float = 0.0
+    expected_bytes: float = 0.0
+    expected_seconds: float = 0.0
+
+
+class CostEstimator:
+    """Dry-run cost model built on the fetcher's own planning and recorded stats."""
+
+    def __init__(self, scanner: TermScanner, fetcher: LinkFetcher):
+        self.scanner = scanner
+        self.fetcher = fetcher
+
+    def source_requests(self, source: str, search_term: str) -> Tuple[int, int]:
+        """(requests, bytes) one source issues for a term when it misses."""
+        if source == "SEP":
+            probes = len(self.fetcher.sep_entry_urls(search_term))
+            return probes + 1, probes * PROBE_BYTES + SEP_SEARCH_BYTES
+        if source == "Wikipedia":
+            return 2, 2 * WIKIPEDIA_API_BYTES  # query, then opensearch
+        if source in ("Scholarpedia", "IEP"):
+            return 1, PROBE_BYTES
+        return 0, 0  # PhilPapers and arXiv only build search URLs
+
+    def estimate_term(self, term: str, category: Optional[str], files: int = 1) -> TermEstimate:
+        """
+        Classify a term and, if it needs the network, price its resolution.
+
+        Misses aren't cached, so a term found in several files is resolved
+        again in every file for as long as all of its sources keep missing.
+        """
+        estimate = TermEstimate(term=term, category=category or "any", status="unresolved", files=files)
+
+        local = self.fetcher.local_link(term, category)
+        if local is not None:
+            estimate.status = "cache_hit" if local[0] else "known_miss"
+            return estimate
+
+        search_term, stats_category, source_order = self.fetcher.plan_resolution(term, category)
+        estimate.source_order = source_order
+
+        reach = 1.0  # Probability the resolver gets as far as this source
+        miss_requests, miss_bytes, miss_seconds = 0, 0.0, 0.0  # Cost when every source misses
+        for source in source_order:
+            requests, size = self.source_requests(source, search_term)
+            stats = self.fetcher.source_stats.get(stats_category, source)
+            hit_rate = stats["hit_rate"] if stats["hit_rate"] is not None else DEFAULT_HIT_RATES.get(source, 0.3)
+            seconds = stats["mean_seconds"] if stats["mean_seconds"] is not None else requests * DEFAULT_REQUEST_SECONDS
+            seconds += self.fetcher.request_delay  # Slept after every miss
+
+            estimate.expected_requests += reach * requests
+            estimate.expected_bytes += reach * size
+            estimate.expected_seconds += reach * (seconds - hit_rate * self.fetcher.request_delay)
+            miss_requests += requests
+            miss_bytes += size
+            miss_seconds += seconds
+            reach *= 1 - hit_rate
+
+        repeats = files - 1
+        estimate.max_requests = files * miss_requests
+        estimate.expected_requests += repeats * reach * miss_requests
+        estimate.expected_bytes += repeats * reach * miss_bytes
+        estimate.expected_seconds += repeats * reach * miss_seconds
+        return estimate
+
+    def estimate_files(self, files: List[Path], mode: str = "index", link_all: bool = False,
+                       workers: int = 1) -> Dict:
+        """
+        Estimate a run over files. mode "index" resolves every found term;
+        "link" skips unknown-category terms unless link_all is set.
+        """
+        file_counts: Dict[Tuple[str, Optional[str]], int] = {}
+        total_terms = 0
+        for file_path in files:
+            seen = {}
+            for term_info in self.scanner.scan_file(file_path):
+                if mode == "link" and not link_all and term_info.category == "unknown":
+                    continue
+                total_terms += 1
+                # Mirror the real runs: indexing resolves each term once per file
+                # (first category wins), linking once per (term, category)
+                key = (term_info.term, term_info.category)
+                seen.setdefault(term_info.term if mode == "index" else key, key)
+            for key in seen.values():
+                file_counts[key] = file_counts.get(key, 0) + 1
+
+        estimates = [self.estimate_term(term, category, count)
+                     for (term, category), count in file_counts.items()]
+        unresolved = [e for e in estimates if e.status == "unresolved"]
+        expected_seconds = sum(e.expected_seconds for e in unresolved)
+
+        return {
+            "mode": mode,
+            "files": len(files),
+            "term_occurrences": total_terms,
+            "unique_terms": len(estimates),
+            "cache_hits": sum(1 for e in estimates if e.status == "cache_hit"),
+            "known_misses": sum(1 for e in estimates if e.status == "known_miss"),
+            "unresolved": len(unresolved),
+            "max_requests": sum(e.max_requests for e in unresolved),
+            "expected_requests": round(sum(e.expected_requests for e in unresolved), 1),
+            "expected_bytes": round(sum(e.expected_bytes for e in unresolved)),
+            "expected_seconds": round(expected_seconds, 1),
+            "expected_seconds_parallel": round(expected_seconds / max(1, workers), 1),
+            "workers": workers,
+            "terms": [e.__dict__ for e in sorted(unresolved, key=lambda e: e.expected_seconds, reverse=True)],
+        }
@@ -7,32 +7,65 @@ import requests
 import json
 import re
 import time
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
 from urllib.parse import quote, urljoin
 
-# Try to import BeautifulSoup, but make it optional
-try:
-    from bs4 import BeautifulSoup
-    HAS_BS4 = True
-except ImportError:
-    HAS_BS4 = False
-    print("Note: Install beautifulsoup4 for better link extraction: pip install beautifulsoup4")
+from config import LINK_SOURCES, TERM_CATEGORIES, KNOWN_TERMS, OUTPUT_SETTINGS, ADAPTIVE_ORDERING
+from probe_engine import ProbeEngine
+from source_stats import SourceStats
+from static_table import StaticLinkTable
+from term_normalizer import canonical_key, curated_variants
+from tracing import Tracer
 
-from config import LINK_SOURCES, TERM_CATEGORIES, KNOWN_TERMS, OUTPUT_SETTINGS
+# Full source names, keyed by the short names used in source orders
+SOURCE_NAMES = {
+    "SEP": "Stanford Encyclopedia of Philosophy",
+    "PhilPapers": "PhilPapers",
+    "Scholarpedia": "Scholarpedia",
+    "arXiv": "arXiv",
+    "IEP": "Internet Encyclopedia of Philosophy",
+    "Wikipedia": "Wikipedia",
+}
+
+# First entry link on an SEP search results page
+SEP_ENTRY_LINK_PATTERN = re.compile(r"""<a\s[^>]*?href=["']([^"']*/entries/[^"'#?]+)["']""", re.IGNORECASE)
 
 
 class LinkFetcher:
     """Fetches and validates links from academic sources."""
 
-    def __init__(self, cache_enabled: bool = True):
+    def __init__(self, cache_enabled: bool = True, tracer: Optional[Tracer] = None,
+                 verbose: bool = True, base_urls: Optional[Dict[str, str]] = None):
         self.cache_enabled = cache_enabled
+        self.tracer = tracer or Tracer()
+        self.verbose = verbose
+        # Source base URLs from config, keyed by short name; overridable (e.g. for load tests)
+        self.base_urls = {source["short"]: source["base_url"] for source in LINK_SOURCES.values()}
+        self.base_urls.update(base_urls or {})
+        self.request_delay = ADAPTIVE_ORDERING.get("probe_delay_seconds", 0.5)  # Politeness delay after a miss
         self.cache_file = Path(__file__).parent / OUTPUT_SETTINGS.get("cache_file", "link_cache.json")
-        self.cache = self._load_cache()
+        self._cache_lock = threading.Lock()
+        # Lookups being resolved right now, by cache_key; concurrent callers share them
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self.set_cache(self._load_cache())
+        self.cache_batch_size = 1  # Cache writes buffered before saving; see batch_cache_writes()
+        self._pending_cache_writes = 0
+        self.source_stats = SourceStats(
+            Path(__file__).parent / OUTPUT_SETTINGS.get("stats_file", "source_stats.json")
+        )
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "TheophysicsLexicon/1.0 (Academic Research Tool)"
         })
+        self.probe = ProbeEngine(self.session)
+        self.static_table = StaticLinkTable.load(
+            Path(__file__).parent / OUTPUT_SETTINGS.get("static_table_file", "static_links.json")
+        )
 
     def _load_cache(self) -> Dict:
         """Load cached links from file."""
@@ -44,65 +77,92 @@ class LinkFetcher:
                 return {}
         return {}
 
+    def set_cache(self, cache: Dict):
+        """Replace the link cache and reindex its spelling variants."""
+        with self._cache_lock:
+            self.cache = cache
+            # Canonical cache key -> stored cache key, so spelling variants share one entry
+            self._cache_variants: Dict[str, str] = {}
+            for stored_key in cache:
+                term, _, category = stored_key.rpartition(":")
+                self._cache_variants.setdefault(self.cache_key(term, category), stored_key)
+
+    def log(self, message: str, end: str = "\n"):
+        """Print if verbose mode is on."""
+        if self.verbose:
+            print(message, end=end)
+
     def _save_cache(self):
         """Save cache to file."""
+        self._pending_cache_writes = 0
         if self.cache_enabled:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
+            with self.tracer.span("cache_save", category="io", entries=len(self.cache)):
+                with open(self.cache_file, 'w') as f:
+                    json.dump(self.cache, f, indent=2)
+
+    def flush(self):
+        """Write any buffered cache entries and source statistics."""
+        with self._cache_lock:
+            if self._pending_cache_writes:
+                self._save_cache()
+        self.source_stats.save()
+
+    @contextmanager
+    def batch_cache_writes(self, batch_size: int = 50):
+        """
+        Buffer cache saves so the cache file is rewritten once per batch_size
+        new entries instead of once per hit. Everything is flushed on exit.
+        """
+        previous = self.cache_batch_size
+        self.cache_batch_size = max(1, batch_size)
+        try:
+            yield
+        finally:
+            self.cache_batch_size = previous
+            self.flush()
 
     def _check_url_exists(self, url: str) -> bool:
         """Check if a URL returns a valid response."""
-        try:
-            response = self.session.head(url, timeout=5, allow_redirects=True)
-            return response.status_code == 200
-        except:
-            try:
-                # Some sites don't support HEAD, try GET
-                response = self.session.get(url, timeout=5, allow_redirects=True)
-                return response.status_code == 200
-            except:
-                return False
+        return self.probe.probe(url).exists
 
-    def fetch_sep_link(self, term: str) -> Optional[str]:
-        """
-        Fetch link from Stanford Encyclopedia of Philosophy.
-        SEP has clean URLs like: https://plato.stanford.edu/entries/einstein-philscience/
-        """
+    def _resolve_url(self, url: str) -> Optional[str]:
+        """Return the redirect-resolved canonical URL if the page exists, else None."""
+        result = self.probe.probe(url)
+        return result.final_url if result.exists else None
+
+    def sep_entry_urls(self, term: str) -> List[str]:
+        """SEP entry URLs probed for a term, in order: the direct slug, then common variations."""
         # Try direct entry URL first (most reliable)
         slug = term.lower().replace(" ", "-").replace("'", "")
-        direct_url = f"https://plato.stanford.edu/entries/{slug}/"
-
-        if self._check_url_exists(direct_url):
-            return direct_url
-
-        # Try common variations
         variations = [
             slug,
-            slug.replace("-", ""),
+            slug.replace("-", ""),  # Same as slug for one-word terms
             f"{slug}-philosophy",
             f"qt-{slug}",  # quantum terms
             f"physics-{slug}",
         ]
+        # Each distinct URL is probed once
+        return [f"{self.base_urls['SEP']}/entries/{var}/" for var in dict.fromkeys(variations)]
 
-        for var in variations:
-            url = f"https://plato.stanford.edu/entries/{var}/"
-            if self._check_url_exists(url):
-                return url
+    def sep_search_url(self, term: str) -> str:
+        """SEP full-text search URL for a term."""
+        return f"{self.base_urls['SEP']}/search/searcher.py?query={quote(term)}"
 
-        # Try search if direct doesn't work
-        if HAS_BS4:
-            try:
-                search_url = f"https://plato.stanford.edu/search/searcher.py?query={quote(term)}"
-                response = self.session.get(search_url, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    # Look for first result link
-                    for link in soup.find_all('a', href=True):
-                        href = link['href']
-                        if '/entries/' in href:
-                            return urljoin("https://plato.stanford.edu", href)
-            except:
-                pass
+    def fetch_sep_link(self, term: str) -> Optional[str]:
+        """
+        Fetch link from Stanford Encyclopedia of Philosophy.
+        SEP has clean URLs like: https://plato.stanford.edu/entries/einstein-philscience/
+        """
+        for url in self.sep_entry_urls(term):
+            resolved = self._resolve_url(url)
+            if resolved:
+                return resolved
+
+        # Try search if direct doesn't work - stream the results page and
+        # stop at the first entry link instead of parsing the whole page
+        match = self.probe.find_first(self.sep_search_url(term), SEP_ENTRY_LINK_PATTERN)
+        if match:
+            return urljoin(self.base_urls["SEP"], match.group(1))
 
         return None
 
@@ -111,7 +171,7 @@ class LinkFetcher:
         Fetch link from Wikipedia using their API.
         Returns the canonical article URL if found.
         """
-        api_url = "https://en.wikipedia.org/w/api.php"
+        api_url = f"{self.base_urls['Wikipedia']}/w/api.php"
 
         # First, try to find the exact page
         params = {
@@ -128,8 +188,7 @@ class LinkFetcher:
 
             for page_id, page_data in pages.items():
                 if page_id != "-1":  # -1 means page not found
-                    title = page_data.get("title", term)
-                    return f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+                    return self.wikipedia_article_url(page_data.get("title", term))
 
             # If exact match fails, try search
             search_params = {
@@ -146,34 +205,36 @@ class LinkFetcher:
                 return data[3][0]
 
         except Exception as e:
-            print(f"Wikipedia API error: {e}")
+            self.log(f"Wikipedia API error: {e}")
 
         return None
 
-    def fetch_scholarpedia_link(self, term: str) -> Optional[str]:
-        """Fetch link from Scholarpedia."""
+    def wikipedia_article_url(self, title: str) -> str:
+        """Article URL for a Wikipedia page title."""
+        return f"{self.base_urls['Wikipedia']}/wiki/{quote(title.replace(' ', '_'))}"
+
+    def scholarpedia_url(self, term: str) -> str:
+        """Scholarpedia article URL for a term."""
         slug = term.replace(" ", "_")
-        url = f"http://www.scholarpedia.org/article/{slug}"
+        return f"{self.base_urls['Scholarpedia']}/article/{slug}"
 
-        if self._check_url_exists(url):
-            return url
+    def fetch_scholarpedia_link(self, term: str) -> Optional[str]:
+        """Fetch link from Scholarpedia."""
+        return self._resolve_url(self.scholarpedia_url(term))
 
-        return None
+    def iep_url(self, term: str) -> str:
+        """IEP article URL for a term."""
+        slug = term.lower().replace(" ", "-").replace("'", "")
+        return f"{self.base_urls['IEP']}/{slug}/"
 
     def fetch_iep_link(self, term: str) -> Optional[str]:
         """Fetch link from Internet Encyclopedia of Philosophy."""
-        slug = term.lower().replace(" ", "-").replace("'", "")
-        url = f"https://iep.utm.edu/{slug}/"
-
-        if self._check_url_exists(url):
-            return url
-
-        return None
+        return self._resolve_url(self.iep_url(term))
 
     def fetch_philpapers_link(self, term: str) -> Optional[str]:
         """Fetch link from PhilPapers."""
         # PhilPapers uses search URLs
-        search_url = f"https://philpapers.org/s/{quote(term)}"
+        search_url = f"{self.base_urls['PhilPapers']}/s/{quote(term)}"
 
         # Just return the search URL as PhilPapers doesn't have stable entry URLs
         # like SEP does
@@ -182,7 +243,7 @@ class LinkFetcher:
     def fetch_arxiv_link(self, term: str) -> Optional[str]:
         """Fetch link from arXiv."""
         # arXiv search URL
-        search_url = f"https://arxiv.org/search/?query={quote(term)}&searchtype=all"
+        search_url = f"{self.base_urls['arXiv']}/search/?query={quote(term)}&searchtype=all"
         return search_url
 
     def get_link(self, term: str, category: Optional[str] = None) -> Tuple[Optional[str], str]:
@@ -196,13 +257,94 @@ class LinkFetcher:
         Returns:
             Tuple of (url, source_name) or (None, "")
         """
-        # Check cache first
-        cache_key = f"{term}:{category or 'any'}"
-        if cache_key in self.cache:
-            cached = self.cache[cache_key]
+        with self.tracer.span("get_link", category="term", term=term, term_category=category or "any"):
+            return self._get_link(term, category)
+
+    def _get_link(self, term: str, category: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """get_link without the trace span."""
+        local = self.local_link(term, category)
+        if local is not None:
+            return local
+
+        # Directory runs share this fetcher across threads: if another worker
+        # is already resolving the term, wait for its answer instead
+        key = self.cache_key(term, category)
+        with self._in_flight_lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                future = Future()
+                self._in_flight[key] = future
+        if in_flight is not None:
+            return in_flight.result()
+
+        try:
+            # The previous owner may have cached it between our two checks
+            local = self.local_link(term, category)
+            if local is not None:
+                url, source_name = local
+            else:
+                url, source_name = self.resolve_from_sources(term, category)
+                if url:
+                    self.store_link(term, category, url, source_name)
+            future.set_result((url, source_name))
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+        return url, source_name
+
+    def canonical_term(self, term: str) -> str:
+        """The curated spelling of term if it is a variant of one, else term."""
+        return curated_variants().get(term) or term
+
+    def cache_key(self, term: str, category: Optional[str] = None) -> str:
+        """
+        Cache key shared by every spelling variant of a term. Plurals only
+        fold for curated phrases, so "Mills" never shares "Mill"'s entry.
+        """
+        return f"{canonical_key(self.canonical_term(term))}:{category or 'any'}"
+
+    def local_link(self, term: str, category: Optional[str] = None) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Answer from the static table or the cache without any network I/O.
+        Spelling variants ("Chalmers'", "Schrodinger") share their term's entry.
+        Returns (url, source_name), or None if the term needs resolving.
+        """
+        # Curated terms resolve from the prebuilt static table with no I/O
+        static = self.static_table.get(self.canonical_term(term))
+        if static is not None:
+            return static.get("url"), static.get("source", "")
+
+        # Check cache next
+        stored_key = self._cache_variants.get(self.cache_key(term, category))
+        cached = self.cache.get(stored_key) if stored_key else None
+        if cached is not None:
             return cached.get("url"), cached.get("source", "")
 
-        # Check if it's a known term
+        return None
+
+    def store_link(self, term: str, category: Optional[str], url: str, source_name: str):
+        """Cache a resolved link (guarded: directory runs share one fetcher across threads)."""
+        with self._cache_lock:
+            stored_key = self._cache_variants.setdefault(self.cache_key(term, category),
+                                                         f"{term}:{category or 'any'}")
+            self.cache[stored_key] = {"url": url, "source": source_name}
+            self._pending_cache_writes += 1
+            if self._pending_cache_writes >= self.cache_batch_size:
+                self._save_cache()
+
+    def plan_resolution(self, term: str, category: Optional[str] = None,
+                        explore: bool = False) -> Tuple[str, str, List[str]]:
+        """
+        Work out how to resolve a term: returns (search_term, stats_category,
+        source_order). Shared by the sync and async resolvers, which pass
+        explore so skipped sources still get an occasional probe.
+        """
+        # Check if it's a known term (under any spelling)
+        term = self.canonical_term(term)
         term_info = KNOWN_TERMS.get(term, {})
         if term_info:
             category = category or term_info.get("category")
@@ -211,42 +353,67 @@ class LinkFetcher:
             search_term = term
 
         # Determine source order based on category
-        if category and category in TERM_CATEGORIES:
-            preferred = TERM_CATEGORIES[category]["preferred_sources"]
-            source_order = preferred + [s for s in ["SEP", "Scholarpedia", "IEP", "Wikipedia"] if s not in preferred]
-        else:
-            source_order = ["SEP", "Scholarpedia", "IEP", "Wikipedia"]
+        source_order = self.configured_source_order(category)
+
+        stats_category = category or "any"
+        if not self.is_strict(term, category):
+            source_order = self.source_stats.order(stats_category, source_order, explore=explore)
+
+        return search_term, stats_category, [s for s in source_order if s in SOURCE_NAMES]
+
+    def resolve_from_sources(self, term: str, category: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """
+        Resolve a term against the live sources, bypassing the static table
+        and the cache. Returns (url, source_name) or (None, "").
+        """
+        search_term, stats_category, source_order = self.plan_resolution(term, category, explore=True)
 
         # Try each source in order
         fetchers = {
-            "SEP": (self.fetch_sep_link, "Stanford Encyclopedia of Philosophy"),
-            "PhilPapers": (self.fetch_philpapers_link, "PhilPapers"),
-            "Scholarpedia": (self.fetch_scholarpedia_link, "Scholarpedia"),
-            "arXiv": (self.fetch_arxiv_link, "arXiv"),
-            "IEP": (self.fetch_iep_link, "Internet Encyclopedia of Philosophy"),
-            "Wikipedia": (self.fetch_wikipedia_link, "Wikipedia"),
+            "SEP": self.fetch_sep_link,
+            "PhilPapers": self.fetch_philpapers_link,
+            "Scholarpedia": self.fetch_scholarpedia_link,
+            "arXiv": self.fetch_arxiv_link,
+            "IEP": self.fetch_iep_link,
+            "Wikipedia": self.fetch_wikipedia_link,
         }
 
+        result = (None, "")
         for source in source_order:
-            if source in fetchers:
-                fetcher, source_name = fetchers[source]
-                print(f"  Trying {source} for '{search_term}'...", end=" ")
-
-                url = fetcher(search_term)
-
-                if url:
-                    print(f"Found!")
-                    # Cache the result
-                    self.cache[cache_key] = {"url": url, "source": source_name}
-                    self._save_cache()
-                    return url, source_name
-                else:
-                    print("Not found")
-
-                # Small delay to be respectful to servers
-                time.sleep(0.5)
-
-        return None, ""
+            self.log(f"  Trying {source} for '{search_term}'...", end=" ")
+
+            started = time.perf_counter()
+            with self.tracer.span("fetch", category="network", source=source, term=search_term):
+                url = fetchers[source](search_term)
+            self.source_stats.record(stats_category, source, url is not None,
+                                     time.perf_counter() - started)
+
+            if url:
+                self.log("Found!")
+                result = (url, SOURCE_NAMES[source])
+                break
+            else:
+                self.log("Not found")
+
+            # Small delay to be respectful to servers
+            time.sleep(self.request_delay)
+
+        if self.cache_batch_size == 1:
+            self.source_stats.save()
+        return result
+
+    def configured_source_order(self, category: Optional[str]) -> List[str]:
+        """The source hierarchy from config for a category, before any adaptive reordering."""
+        if category and category in TERM_CATEGORIES:
+            preferred = TERM_CATEGORIES[category]["preferred_sources"]
+            return preferred + [s for s in ["SEP", "Scholarpedia", "IEP", "Wikipedia"] if s not in preferred]
+        return ["SEP", "Scholarpedia", "IEP", "Wikipedia"]
+
+    def is_strict(self, term: str, category: Optional[str]) -> bool:
+        """Curated terms and strict categories always use the configured source order."""
+        return (ADAPTIVE_ORDERING.get("mode", "adaptive") == "strict"
+                or category in ADAPTIVE_ORDERING.get("strict_categories", [])
+                or term in KNOWN_TERMS)
 
     def format_link(self, term: str, url: str, source: str, format: str = "markdown") -> str:
         """Format a link for output."""
@@ -0,0 +1,221 @@
+"""
+Link Index - SQLite-backed store for directory link indexes.
+
+Instead of one big JSON document, the index keeps a terms table, a files
+table (each path stored once) and a term<->file occurrence table. Files are
+written as they are processed, and lookups like "which notes mention
+Wheeler?" are answered with an indexed query instead of parsing everything.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+INDEX_FILE_NAME = "link_index.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    total_terms INTEGER NOT NULL DEFAULT 0,
+    linked_terms INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT UNIQUE NOT NULL COLLATE NOCASE,
+    url TEXT,
+    source TEXT,
+    category TEXT,
+    is_proper_noun INTEGER,
+    is_glossary_term INTEGER
+);
+CREATE TABLE IF NOT EXISTS occurrences (
+    term_id INTEGER NOT NULL REFERENCES terms(id),
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    PRIMARY KEY (term_id, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS occurrences_by_file ON occurrences(file_id, term_id);
+"""
+
+
+class LinkIndex:
+    """Term->files and file->terms link index stored in SQLite."""
+
+    def __init__(self, db_path: Path, connection: sqlite3.Connection):
+        self.db_path = db_path
+        self.conn = connection
+        self._file_ids: Dict[str, int] = {}
+        self._term_ids: Dict[str, int] = {}
+        self._tmp_path: Optional[Path] = None  # Set while a fresh index is being written
+
+    @classmethod
+    def open(cls, path: Path) -> "LinkIndex":
+        """Open an existing index read-only. path may be the db or its directory."""
+        db_path = path / INDEX_FILE_NAME if path.is_dir() else path
+        if not db_path.exists():
+            raise FileNotFoundError(f"Index not found: {db_path}")
+        # as_uri() percent-escapes "?", "#" and "%" so they stay part of the path
+        conn = sqlite3.connect(db_path.resolve().as_uri() + "?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        return cls(db_path, conn)
+
+    @classmethod
+    def create(cls, output_dir: Path) -> "LinkIndex":
+        """
+        Start a fresh index in output_dir.
+
+        Writes go to a temp database that replaces the real one on close(),
+        so readers never see a half-written index.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        db_path = output_dir / INDEX_FILE_NAME
+        tmp_path = db_path.with_name(db_path.name + ".tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        conn = sqlite3.connect(tmp_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+        index = cls(db_path, conn)
+        index._tmp_path = tmp_path
+        return index
+
+    def _file_id(self, path: str) -> int:
+        """Intern a file path, returning its row id."""
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO files (path) VALUES (?)", (path,))
+            file_id = self.conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()[0]
+            self._file_ids[path] = file_id
+        return file_id
+
+    def _term_id(self, term: str, info: Dict) -> int:
+        """Intern a term, keeping the first link info seen for it."""
+        key = term.lower()
+        term_id = self._term_ids.get(key)
+        if term_id is None:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO terms "
+                "(term, url, source, category, is_proper_noun, is_glossary_term) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (term, info.get("url"), info.get("source"), info.get("category"),
+                 info.get("is_proper_noun"), info.get("is_glossary_term"))
+            )
+            term_id = self.conn.execute("SELECT id FROM terms WHERE term = ?", (term,)).fetchone()[0]
+            self._term_ids[key] = term_id
+        return term_id
+
+    def add_file_index(self, file_index: Dict):
+        """Stream one file's index (from AutoLinker.generate_link_index) into the store."""
+        file_id = self._file_id(file_index["source_file"])
+        self.conn.execute(
+            "UPDATE files SET total_terms = ?, linked_terms = ? WHERE id = ?",
+            (file_index["total_terms"], file_index["linked_terms"], file_id)
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO occurrences (term_id, file_id) VALUES (?, ?)",
+            [(self._term_id(term, info), file_id) for term, info in file_index["terms"].items()]
+        )
+        self.conn.commit()
+
+    def set_meta(self, **values):
+        """Record run-level summary values."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, str(value)) for key, value in values.items()]
+        )
+        self.conn.commit()
+
+    def close(self):
+        """Close the index, publishing it if it was being written."""
+        self.conn.close()
+        if self._tmp_path is not None:
+            os.replace(self._tmp_path, self.db_path)
+            self._tmp_path = None
+
+    def discard(self):
+        """Close without publishing; a fresh index being written is deleted."""
+        self.conn.close()
+        if self._tmp_path is not None:
+            if self._tmp_path.exists():
+                self._tmp_path.unlink()
+            self._tmp_path = None
+
+    def __enter__(self) -> "LinkIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Queries
+
+    def meta(self) -> Dict[str, str]:
+        """Return run-level summary values."""
+        return {row["key"]: row["value"] for row in self.conn.execute("SELECT key, value FROM meta")}
+
+    def lookup_term(self, term: str) -> Optional[Dict]:
+        """Return link info for a term (case-insensitive), or None."""
+        row = self.conn.execute("SELECT * FROM terms WHERE term = ?", (term,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "term": row["term"],
+            "url": row["url"],
+            "source": row["source"],
+            "category": row["category"],
+            "is_proper_noun": bool(row["is_proper_noun"]),
+            "is_glossary_term": bool(row["is_glossary_term"]),
+        }
+
+    def files_for_term(self, term: str) -> List[str]:
+        """Which files mention this term?"""
+        rows = self.conn.execute(
+            "SELECT files.path FROM terms "
+            "JOIN occurrences ON occurrences.term_id = terms.id "
+            "JOIN files ON files.id = occurrences.file_id "
+            "WHERE terms.term = ? ORDER BY files.path",
+            (term,)
+        )
+        return [row["path"] for row in rows]
+
+    def matching_files(self, path: str) -> List[str]:
+        """Stored paths a query path refers to: an exact match, else every path ending in it."""
+        row = self.conn.execute("SELECT path FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            return [row["path"]]
+        rows = self.conn.execute(
+            "SELECT path FROM files WHERE path LIKE ? ESCAPE '\\' ORDER BY path",
+            ("%" + _escape_like(os.sep + path.lstrip(os.sep)),)
+        )
+        return [row["path"] for row in rows]
+
+    def terms_for_file(self, path: str) -> Tuple[Optional[str], List[Dict]]:
+        """
+        Which terms does this file mention? path may be the stored path or a
+        suffix of it. Returns (matched_path, terms); (None, []) if no file
+        matches. Raises ValueError if a suffix matches several files.
+        """
+        matches = self.matching_files(path)
+        if len(matches) > 1:
+            raise ValueError(f"'{path}' matches {len(matches)} files; pass one of: " + ", ".join(matches))
+        if not matches:
+            return None, []
+        rows = self.conn.execute(
+            "SELECT terms.term, terms.url, terms.source, terms.category FROM files "
+            "JOIN occurrences ON occurrences.file_id = files.id "
+            "JOIN terms ON terms.id = occurrences.term_id "
+            "WHERE files.path = ? ORDER BY terms.term",
+            (matches[0],)
+        )
+        return matches[0], [dict(row) for row in rows]
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so paths match literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
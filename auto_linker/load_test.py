@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Load Test - Measures the resolver end to end against local stand-in sources.
+
+Starts a fake server that mimics the URL shapes the fetchers use (SEP entries
+and search, IEP, Scholarpedia articles, and the MediaWiki query/opensearch
+API), with configurable latency, error rate and 404 ratio. Then runs the
+index and/or link workloads against it and reports terms/second, requests per
+term and lookup tail latency. Nothing touches the real sites.
+
+Usage:
+    python load_test.py                                  # Synthetic corpus, both workloads
+    python load_test.py --corpus ./papers --workload link -j 8
+    python load_test.py --latency 0.2 --jitter 0.05 --error-rate 0.02 --not-found 0.7
+    python load_test.py --no-head --json                 # Force the GET probe fallback
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+import zlib
+from bisect import bisect_left, bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+from auto_linker import AutoLinker
+from config import KNOWN_TERMS, GLOSSARY_TERMS
+from link_fetcher import LinkFetcher
+from source_stats import SourceStats
+from static_table import StaticLinkTable
+from tracing import Tracer
+
+# Path prefix for each source on the fake server
+SOURCE_PREFIXES = {
+    "SEP": "/sep",
+    "IEP": "/iep",
+    "Scholarpedia": "/scholarpedia",
+    "Wikipedia": "/wikipedia",
+}
+
+
+class FakeSourceServer:
+    """Local HTTP server standing in for SEP, IEP, Scholarpedia and Wikipedia."""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, error_rate: float = 0.0,
+                 not_found: float = 0.5, page_size: int = 50_000, support_head: bool = True,
+                 seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.not_found = not_found
+        self.page_size = page_size
+        self.support_head = support_head
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "bytes_sent": 0, "by_source": {}, "by_status": {}}
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        """LinkFetcher base_urls override pointing every probing source here."""
+        return {source: self.base_url + prefix for source, prefix in SOURCE_PREFIXES.items()}
+
+    def start(self) -> "FakeSourceServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeSourceServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def exists(self, source: str, key: str) -> bool:
+        """Deterministic per-page existence, so repeated probes agree."""
+        digest = zlib.crc32(f"{source}:{key.lower()}".encode("utf-8"))
+        return digest / 2**32 >= self.not_found
+
+    def _record(self, source: str, status: int, bytes_sent: int):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_sent"] += bytes_sent
+            self.stats["by_source"][source] = self.stats["by_source"].get(source, 0) + 1
+            self.stats["by_status"][str(status)] = self.stats["by_status"].get(str(status), 0) + 1
+
+    def _delay_and_fail(self) -> bool:
+        """Sleep for the configured latency; return True if this request should error."""
+        with self._lock:
+            delay = max(0.0, self._random.gauss(self.latency, self.jitter)) if self.jitter else self.latency
+            fail = self._random.random() < self.error_rate
+        time.sleep(delay)
+        return fail
+
+    def _page(self, title: str) -> bytes:
+        head = f"<html><head><title>{title}</title></head><body><h1>{title}</h1>".encode("utf-8")
+        return head + b"<p>" + b"x" * max(0, self.page_size - len(head) - 20) + b"</p></body></html>"
+
+    def _route(self, path: str, query: Dict[str, List[str]]):
+        """Return (source, status, content_type, body) for a request path."""
+        for source, prefix in SOURCE_PREFIXES.items():
+            if path.startswith(prefix + "/"):
+                rest = unquote(path[len(prefix):])
+                break
+        else:
+            return "other", 404, "text/plain", b"not found"
+
+        if source == "SEP" and rest == "/search/searcher.py":
+            term = query.get("query", [""])[0]
+            slug = term.lower().replace(" ", "-")
+            results = "".join(f"<p>Result {i}</p>" for i in range(200))
+            if self.exists("SEP-search", term):
+                results = f'<a href="{prefix}/entries/{quote(slug)}/">{term}</a>' + results
+            return source, 200, "text/html", f"<html><body>{results}</body></html>".encode("utf-8")
+
+        if source == "Wikipedia" and rest == "/w/api.php":
+            action = query.get("action", [""])[0]
+            if action == "query":
+                title = query.get("titles", [""])[0]
+                page_id = str(zlib.crc32(title.encode("utf-8"))) if self.exists(source, title) else "-1"
+                data = {"query": {"pages": {page_id: {"title": title}}}}
+            else:
+                term = query.get("search", [""])[0]
+                if self.exists("Wikipedia-search", term):
+                    url = f"{self.base_url}{prefix}/wiki/{quote(term.replace(' ', '_'))}"
+                    data = [term, [term], [""], [url]]
+                else:
+                    data = [term, [], [], []]
+            return source, 200, "application/json", json.dumps(data).encode("utf-8")
+
+        # Article pages: /entries/<slug>/, /<slug>/, /article/<slug>, /wiki/<title>
+        key = rest.strip("/").split("/")[-1]
+        if key and self.exists(source, key):
+            return source, 200, "text/html", self._page(key)
+        return source, 404, "text/html", b"<html><body>Not found</body></html>"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, send_body: bool):
+                parsed = urlparse(self.path)
+                if server._delay_and_fail():
+                    source, status, content_type, body = "error", 500, "text/plain", b"server error"
+                elif not send_body and not server.support_head:
+                    source, status, content_type, body = "head", 405, "text/plain", b""
+                else:
+                    source, status, content_type, body = server._route(parsed.path, parse_qs(parsed.query))
+
+                # Honor simple "bytes=0-N" ranges like the probe engine sends
+                range_header = self.headers.get("Range", "")
+                if status == 200 and range_header.startswith("bytes=0-"):
+                    end = int(range_header[len("bytes=0-"):] or len(body) - 1)
+                    if end + 1 < len(body):
+                        status, body = 206, body[:end + 1]
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if send_body:
+                    try:
+                        self.wfile.write(body)
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass  # Probe closed the connection early, as intended
+                server._record(source, status, len(body) if send_body else 0)
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+        return Handler
+
+
+def generate_corpus(dir_path: Path, files: int = 20, terms_per_file: int = 15, seed: int = 0):
+    """Write a synthetic vault mixing known, glossary and made-up terms."""
+    rng = random.Random(seed)
+    syllables = ["zor", "bel", "kan", "vir", "tal", "mos", "quen", "dri", "lux", "pra"]
+    made_up = [
+        (rng.choice(syllables) + rng.choice(syllables) + rng.choice(syllables)).capitalize()
+        for _ in range(200)
+    ]
+    vocabulary = list(KNOWN_TERMS) + list(GLOSSARY_TERMS) + made_up
+
+    dir_path.mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        lines = [f"# Note {i}", ""]
+        for _ in range(terms_per_file):
+            a, b = rng.sample(vocabulary, 2)
+            lines.append(f"In this note the {a} idea meets {b} in passing.")
+        (dir_path / f"note_{i:04d}.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def run_workload(workload: str, corpus: Path, server: FakeSourceServer, work_dir: Path,
+                 workers: int = 4, request_delay: float = 0.0) -> Dict:
+    """Run one index or link workload against the fake server with a cold cache."""
+    tracer = Tracer(enabled=True)
+    linker = AutoLinker(verbose=False, tracer=tracer)
+
+    # Cold, in-memory cache, no static table and throwaway stats so real state is never touched
+    fetcher = LinkFetcher(cache_enabled=False, tracer=tracer, verbose=False,
+                          base_urls=server.base_urls)
+    fetcher.set_cache({})
+    fetcher.static_table = StaticLinkTable(work_dir / "static_links.json")
+    fetcher.source_stats = SourceStats(work_dir / f"{workload}_source_stats.json")
+    fetcher.request_delay = request_delay
+    linker.fetcher = fetcher
+
+    requests_before = server.stats["requests"]
+    bytes_before = server.stats["bytes_sent"]
+    output_dir = work_dir / f"{workload}_output"
+
+    started = time.perf_counter()
+    if workload == "index":
+        linker.process_directory(corpus, output_dir)
+    else:
+        linker.link_directory(corpus, output_dir, link_all=True, workers=workers)
+    elapsed = time.perf_counter() - started
+
+    lookup_events = [e for e in tracer.events if e["name"] == "get_link"]
+    lookups = [e["dur"] / 1_000_000 for e in lookup_events]
+
+    # A lookup went to the network if a fetch span ran inside it on the same thread
+    fetch_starts: Dict[int, List[float]] = {}
+    for event in tracer.events:
+        if event["name"] == "fetch":
+            fetch_starts.setdefault(event["tid"], []).append(event["ts"])
+    for starts in fetch_starts.values():
+        starts.sort()
+    network_lookups = sum(
+        1 for e in lookup_events
+        if bisect_left(fetch_starts.get(e["tid"], []), e["ts"]) <
+        bisect_right(fetch_starts.get(e["tid"], []), e["ts"] + e["dur"])
+    )
+    server_requests = server.stats["requests"] - requests_before
+
+    return {
+        "workload": workload,
+        "wall_seconds": round(elapsed, 3),
+        "lookups": len(lookups),
+        "network_lookups": network_lookups,
+        "terms_per_second": round(len(lookups) / elapsed, 2) if elapsed else None,
+        "server_requests": server_requests,
+        "requests_per_term": round(server_requests / network_lookups, 2) if network_lookups else 0.0,
+        "bytes_received": server.stats["bytes_sent"] - bytes_before,
+        "client_probe_stats": dict(fetcher.probe.stats),
+        "lookup_latency_ms": {
+            "p50": round(percentile(lookups, 50) * 1000, 1),
+            "p95": round(percentile(lookups, 95) * 1000, 1),
+            "p99": round(percentile(lookups, 99) * 1000, 1),
+            "max": round(max(lookups, default=0.0) * 1000, 1),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the auto-linker against local fake sources")
+    parser.add_argument("--corpus", type=Path, help="Markdown directory to use (default: synthetic corpus)")
+    parser.add_argument("--files", type=int, default=20, help="Synthetic corpus: number of files")
+    parser.add_argument("--terms-per-file", type=int, default=15, help="Synthetic corpus: term lines per file")
+    parser.add_argument("--workload", choices=["index", "link", "both"], default="both")
+    parser.add_argument("-j", "--workers", type=int, default=4, help="Worker threads for the link workload")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency standard deviation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--not-found", type=float, default=0.5, help="Fraction of pages that 404")
+    parser.add_argument("--page-size", type=int, default=50_000, help="Article page size in bytes")
+    parser.add_argument("--no-head", action="store_true", help="Answer HEAD with 405 to exercise the GET fallback")
+    parser.add_argument("--request-delay", type=float, default=0.0,
+                        help="Fetcher politeness delay after each miss (the real default is 0.5s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    workloads = ["index", "link"] if args.workload == "both" else [args.workload]
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="auto_linker_load_") as tmp:
+        work_dir = Path(tmp)
+        corpus = args.corpus
+        if corpus is None:
+            corpus = work_dir / "corpus"
+            generate_corpus(corpus, args.files, args.terms_per_file, args.seed)
+
+        with FakeSourceServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              not_found=args.not_found, page_size=args.page_size,
+                              support_head=not args.no_head, seed=args.seed) as server:
+            for workload in workloads:
+                results.append(run_workload(workload, corpus, server, work_dir,
+                                            workers=args.workers, request_delay=args.request_delay))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        latency = result["lookup_latency_ms"]
+        print(f"\n{'='*60}")
+        print(f"LOAD TEST: {result['workload']}")
+        print(f"{'='*60}")
+        print(f"Wall time:          {result['wall_seconds']:.2f}s")
+        print(f"Lookups:            {result['lookups']} ({result['network_lookups']} hit the network)")
+        print(f"Terms/second:       {result['terms_per_second']}")
+        print(f"Requests/term:      {result['requests_per_term']}")
+        print(f"Bytes received:     {result['bytes_received']:,}")
+        print(f"Lookup latency ms:  p50 {latency['p50']}  p95 {latency['p95']}  "
+              f"p99 {latency['p99']}  max {latency['max']}")
+
+
+if __name__ == "__main__":
+    main()
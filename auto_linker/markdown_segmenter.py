@@ -0,0 +1,161 @@
+"""
+Markdown Segmenter - Splits markdown into linkable prose regions.
+
+Code blocks, inline code, YAML front matter, URLs, HTML tags, image alt text,
+wiki links and LaTeX math are never worth linking, and scanning them only
+produces junk candidates (and wasted network lookups). The segmenter finds
+those regions so the scanner can work on prose only, with original offsets.
+
+Indented (four-space) code blocks are not detected: in notes, that much
+indentation is far more often a nested list than code. Use fenced blocks for
+code that must never be linked.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+
+@dataclass
+class Segment:
+    """A linkable prose region of a document."""
+    start: int  # Offset into the original text
+    end: int
+    text: str
+
+
+# YAML front matter: only valid at the very top of the file
+FRONT_MATTER_PATTERN = re.compile(
+    r'\A\ufeff?---[ \t]*\n.*?\n(?:---|\.\.\.)[ \t]*(?:\n|\Z)',
+    re.DOTALL
+)
+
+# Opening/closing line of a fenced code block (``` or ~~~)
+FENCE_PATTERN = re.compile(r'^[ \t]{0,3}(`{3,}|~{3,})')
+
+# Inline constructs to skip within prose blocks
+INLINE_SKIP_PATTERN = re.compile(
+    r'(?<!`)(`+)(?!`)[^\n]*?(?<!`)\1(?!`)'    # inline code, closed by a backtick run of the same length
+    r'|(?<!`)`{3,}[^`\s]*'                    # unclosed ``` run mid-line, with an attached info word
+    r'|!\[[^\]]*\]\([^)]*\)'                  # images, alt text included
+    r'|\[\[[^\]\n]*\]\]'                      # wiki links
+    r'|\]\([^)\s]*(?:\s+"[^"]*")?\)'          # link targets (link text is handled as already-linked)
+    r'|<!--.*?-->'                            # HTML comments
+    r'|<[aA]\b[^>]*>.*?</[aA]>'                 # HTML links, link text included
+    r'|</?[A-Za-z][^>\n]*>'                   # HTML tags
+    r'|\$\$.+?\$\$'                           # display math
+    r'|\$[^\s$](?:[^$\n]*?[^\s$])?\$(?!\d)'   # inline math
+    r'|<?(?:https?|ftp)://[^\s<>)\]]+>?'      # bare URLs and autolinks
+    r'|\bwww\.[^\s<>)\]]+',
+    re.DOTALL
+)
+
+
+def _block_spans(text: str) -> List[Tuple[int, int]]:
+    """Find front matter and fenced code blocks (line-level constructs)."""
+    spans = []
+    pos = 0
+
+    front_matter = FRONT_MATTER_PATTERN.match(text)
+    if front_matter:
+        spans.append((0, front_matter.end()))
+        pos = front_matter.end()
+
+    fence_start = None
+    fence_marker = ""
+    for line in text[pos:].splitlines(keepends=True):
+        match = FENCE_PATTERN.match(line)
+        if fence_start is None:
+            if match:
+                fence_start = pos
+                fence_marker = match.group(1)
+        elif match and match.group(1)[0] == fence_marker[0] and len(match.group(1)) >= len(fence_marker):
+            spans.append((fence_start, pos + len(line)))
+            fence_start = None
+        pos += len(line)
+
+    # An unclosed fence runs to the end of the document
+    if fence_start is not None:
+        spans.append((fence_start, len(text)))
+
+    return spans
+
+
+def find_skipped_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Return sorted, non-overlapping (start, end) spans of non-prose content.
+    """
+    spans = []
+    pos = 0
+
+    for block_start, block_end in _block_spans(text) + [(len(text), len(text))]:
+        for match in INLINE_SKIP_PATTERN.finditer(text, pos, block_start):
+            spans.append((match.start(), match.end()))
+        if block_end > block_start:
+            spans.append((block_start, block_end))
+        pos = block_end
+
+    return spans
+
+
+def iter_prose_segments(text: str) -> Iterator[Segment]:
+    """Yield the linkable prose regions of a markdown document in order."""
+    pos = 0
+    for start, end in find_skipped_spans(text):
+        if start > pos:
+            yield Segment(start=pos, end=start, text=text[pos:start])
+        pos = max(pos, end)
+    if pos < len(text):
+        yield Segment(start=pos, end=len(text), text=text[pos:])
+
+
+def mask_non_prose(text: str) -> str:
+    """
+    Blank out non-prose regions with spaces.
+
+    The result has the same length and the same newlines as the input, so
+    regex match offsets and line numbers still refer to the original text.
+    """
+    spans = find_skipped_spans(text)
+    if not spans:
+        return text
+
+    parts = []
+    pos = 0
+    for start, end in spans:
+        parts.append(text[pos:start])
+        parts.append(re.sub(r'[^\n]', ' ', text[start:end]))
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def main():
+    """Test the markdown segmenter."""
+    test_text = """---
+title: Einstein Notes
+tags: [Physics]
+---
+# Notes on Einstein
+
+Wheeler wrote about `Einstein.method()` and $E = mc^2$ at
+https://example.org/Einstein and <span class="Bohr">Bohr</span>.
+
+```python
+Heisenberg = "Uncertainty"
+```
+
+![Feynman Diagram](feynman.png) and [Penrose](https://example.org) [[Chalmers]].
+"""
+
+    print("=" * 60)
+    print("MARKDOWN SEGMENTER TEST")
+    print("=" * 60)
+
+    for segment in iter_prose_segments(test_text):
+        if segment.text.strip():
+            print(f"  [{segment.start}:{segment.end}] {segment.text.strip()!r}")
+
+
+if __name__ == "__main__":
+    main()
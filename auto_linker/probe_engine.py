@@ -0,0 +1,136 @@
+"""
+Probe Engine - Checks whether source pages exist without downloading them.
+
+A probe is a HEAD request. If the server rejects HEAD, or the request fails,
+the engine falls back to a streamed GET that asks for a small byte range and
+stops reading after a few KB. Each probe records the redirect-resolved
+canonical URL. Search-results pages are read incrementally and searched with
+a targeted regex, so reading stops at the first match.
+"""
+
+import codecs
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+
+# Statuses that mean "HEAD not supported here", not "page missing"
+HEAD_UNSUPPORTED = {405, 501}
+
+# A ranged GET may legitimately answer 206 Partial Content
+EXISTS_STATUSES = {200, 206}
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing a single URL."""
+    url: str
+    exists: bool
+    status: Optional[int]
+    final_url: Optional[str]  # After redirects; the canonical form to link to
+    method: str  # HEAD or GET
+    bytes_read: int
+
+
+class ProbeEngine:
+    """Cheap existence checks and targeted page extraction over a shared session."""
+
+    def __init__(self, session: requests.Session, timeout: float = 5,
+                 max_probe_bytes: int = 4096):
+        self.session = session
+        self.timeout = timeout
+        self.max_probe_bytes = max_probe_bytes
+        self._lock = threading.Lock()
+        self.stats = {"probes": 0, "requests": 0, "bytes_read": 0}
+
+    def _count(self, requests_made: int, bytes_read: int):
+        with self._lock:
+            self.stats["requests"] += requests_made
+            self.stats["bytes_read"] += bytes_read
+
+    def _read_prefix(self, response: requests.Response, limit: int) -> bytes:
+        """Read at most limit body bytes, then release the connection."""
+        data = b""
+        try:
+            for chunk in response.iter_content(chunk_size=min(limit, 8192)):
+                data += chunk
+                if len(data) >= limit:
+                    break
+        finally:
+            response.close()
+        return data[:limit]
+
+    def probe(self, url: str) -> ProbeResult:
+        """Check whether url exists, downloading at most max_probe_bytes of body."""
+        with self._lock:
+            self.stats["probes"] += 1
+
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            self._count(len(response.history) + 1, 0)
+            if response.status_code not in HEAD_UNSUPPORTED:
+                exists = response.status_code == 200
+                return ProbeResult(url, exists, response.status_code,
+                                   response.url if exists else None, "HEAD", 0)
+        except requests.RequestException:
+            pass
+
+        # HEAD rejected or failed: streamed, ranged GET that stops after a few KB
+        try:
+            response = self.session.get(
+                url, timeout=self.timeout, allow_redirects=True, stream=True,
+                headers={"Range": f"bytes=0-{self.max_probe_bytes - 1}"}
+            )
+        except requests.RequestException:
+            return ProbeResult(url, False, None, None, "GET", 0)
+
+        try:
+            body = self._read_prefix(response, self.max_probe_bytes)
+        except requests.RequestException:
+            # Truncated or reset body: a miss, like any other failed request
+            self._count(len(response.history) + 1, 0)
+            return ProbeResult(url, False, response.status_code, None, "GET", 0)
+        self._count(len(response.history) + 1, len(body))
+        exists = response.status_code in EXISTS_STATUSES
+        return ProbeResult(url, exists, response.status_code,
+                           response.url if exists else None, "GET", len(body))
+
+    def find_first(self, url: str, pattern: "re.Pattern", params: Optional[Dict] = None,
+                   max_bytes: int = 256 * 1024, timeout: float = 10) -> Optional["re.Match"]:
+        """
+        Stream a page and return the first match of pattern, stopping as soon
+        as it is found (or after max_bytes).
+        """
+        try:
+            response = self.session.get(url, params=params, timeout=timeout, stream=True)
+        except requests.RequestException:
+            return None
+
+        bytes_read = 0
+        try:
+            if response.status_code != 200:
+                return None
+
+            try:
+                decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            buffer = ""
+            for chunk in response.iter_content(chunk_size=8192):
+                bytes_read += len(chunk)
+                buffer += decoder.decode(chunk)
+                match = pattern.search(buffer)
+                if match:
+                    return match
+                if bytes_read >= max_bytes:
+                    return None
+                # Keep a tail so matches spanning chunk boundaries are still found
+                buffer = buffer[-1024:]
+            return None
+        except requests.RequestException:
+            return None
+        finally:
+            response.close()
+            self._count(1, bytes_read)
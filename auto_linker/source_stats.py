@@ -0,0 +1,133 @@
+"""
+Source Stats - Per-category hit-rate and latency history for link sources.
+
+LinkFetcher records every source probe here. Once a category has enough
+history, sources are tried in the order that minimizes the expected time to
+the first hit (lowest cost / hit-rate first), and sources that practically
+never hit for that category are skipped; if every probing source would be,
+the best of them stays as a fallback. Skipped sources are still tried every
+explore_every lookups, and counts are halved past history_limit probes, so
+a source that starts working again earns its place back.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from config import ADAPTIVE_ORDERING
+
+
+class SourceStats:
+    """Hit/latency statistics per (category, source), persisted as JSON."""
+
+    def __init__(self, stats_file: Path, settings: Dict = ADAPTIVE_ORDERING):
+        self.stats_file = stats_file
+        self.settings = settings
+        self.data: Dict[str, Dict[str, Dict]] = self._load()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._skips: Dict[Tuple[str, str], int] = {}  # Lookups each source has sat out
+
+    def _load(self) -> Dict:
+        """Load recorded statistics from file."""
+        if self.stats_file.exists():
+            try:
+                with open(self.stats_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    def save(self):
+        """Write statistics to file if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            with open(self.stats_file, 'w') as f:
+                json.dump(self.data, f, indent=2, sort_keys=True)
+            self._dirty = False
+
+    def record(self, category: str, source: str, hit: bool, seconds: float):
+        """Record the outcome of one source probe."""
+        with self._lock:
+            entry = self.data.setdefault(category, {}).setdefault(
+                source, {"attempts": 0, "hits": 0, "total_seconds": 0.0}
+            )
+            entry["attempts"] += 1
+            entry["hits"] += int(hit)
+            entry["total_seconds"] += seconds
+
+            # Decay: keep rates and latencies weighted toward recent probes
+            if entry["attempts"] > self.settings.get("history_limit", 200):
+                entry["attempts"] //= 2
+                entry["hits"] //= 2
+                entry["total_seconds"] /= 2
+            self._dirty = True
+
+    def get(self, category: str, source: str) -> Dict:
+        """Return attempts, hits, hit_rate and mean_seconds for a source."""
+        entry = self.data.get(category, {}).get(source, {"attempts": 0, "hits": 0, "total_seconds": 0.0})
+        attempts = entry["attempts"]
+        return {
+            "attempts": attempts,
+            "hits": entry["hits"],
+            "hit_rate": entry["hits"] / attempts if attempts else None,
+            "mean_seconds": entry["total_seconds"] / attempts if attempts else None,
+        }
+
+    def order(self, category: str, sources: List[str], explore: bool = False) -> List[str]:
+        """
+        Reorder sources for a category by expected probe cost.
+
+        The configured order is kept until every reorderable source has at
+        least min_attempts probes recorded. Pinned sources (search-URL
+        sources that never probe) keep their slots. With explore (set for
+        real lookups, not reports or estimates), a skipped source is kept
+        once every explore_every calls so its statistics keep updating.
+        """
+        min_attempts = self.settings.get("min_attempts", 20)
+        pinned = set(self.settings.get("pinned_sources", []))
+        delay = self.settings.get("probe_delay_seconds", 0.5)
+
+        movable = [s for s in sources if s not in pinned]
+        stats = {s: self.get(category, s) for s in movable}
+        if not movable or any(stats[s]["attempts"] < min_attempts for s in movable):
+            return list(sources)
+
+        # Sequential search until the first hit: trying sources in ascending
+        # cost / p order minimizes the expected total cost.
+        def ratio(source: str) -> float:
+            hit_rate = stats[source]["hit_rate"]
+            cost = stats[source]["mean_seconds"] + delay
+            return cost / hit_rate if hit_rate else float("inf")
+
+        reordered = iter(sorted(movable, key=ratio))
+        ordered = [s if s in pinned else next(reordered) for s in sources]
+
+        # Drop sources that practically never hit. If that drops every
+        # probing source, keep the one with the best hit rate as a fallback.
+        skip_below = self.settings.get("skip_below_hit_rate", 0.0)
+        kept = {s for s in movable
+                if stats[s]["hit_rate"] >= skip_below
+                or (explore and self._explore(category, s))}
+        if not kept:
+            kept.add(max(movable, key=lambda s: (stats[s]["hit_rate"], -ratio(s))))
+        return [s for s in ordered if s in pinned or s in kept]
+
+    def _explore(self, category: str, source: str) -> bool:
+        """Count a skip; True on every explore_every-th one, when the source gets another try."""
+        explore_every = self.settings.get("explore_every", 0)
+        if not explore_every:
+            return False
+        with self._lock:
+            skips = self._skips.get((category, source), 0) + 1
+            self._skips[(category, source)] = skips % explore_every
+        return skips >= explore_every
+
+    def report(self) -> Dict[str, Dict[str, Dict]]:
+        """All recorded statistics, as returned by get(), keyed by category then source."""
+        return {
+            category: {source: self.get(category, source) for source in sorted(sources)}
+            for category, sources in sorted(self.data.items())
+        }
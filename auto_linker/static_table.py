@@ -0,0 +1,109 @@
+"""
+Static Table - Prebuilt links for the curated lexicon.
+
+Every term in KNOWN_TERMS and GLOSSARY_TERMS is curated, so its link can be
+resolved once (with `auto_linker.py build-table`) and shipped with the package
+as static_links.json. LinkFetcher consults this table before the cache and
+the network, so curated terms resolve with zero I/O on any machine.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import KNOWN_TERMS, GLOSSARY_TERMS
+
+# Bump when the file layout changes; tables with another version are ignored
+STATIC_TABLE_VERSION = 1
+
+
+def curated_terms() -> List[Tuple[str, str]]:
+    """(term, category) for every curated term; KNOWN_TERMS wins over the glossary."""
+    terms = [(term, info.get("category", "unknown")) for term, info in KNOWN_TERMS.items()]
+    terms += [(term, "concept") for term in GLOSSARY_TERMS if term not in KNOWN_TERMS]
+    return terms
+
+
+class StaticLinkTable:
+    """Versioned term -> link table, keyed by the curated spelling of each term."""
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, Dict]] = None,
+                 generated: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, Dict] = entries or {}
+        self.generated = generated
+
+    @classmethod
+    def load(cls, path: Path) -> "StaticLinkTable":
+        """Load the table, or return an empty one if it is missing, unreadable or another version."""
+        if not path.exists():
+            return cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get("version") != STATIC_TABLE_VERSION:
+            print(f"Note: ignoring {path.name} (version {data.get('version')}, "
+                  f"expected {STATIC_TABLE_VERSION}); rebuild it with: auto_linker.py build-table")
+            return cls(path)
+        return cls(path, data.get("entries", {}), data.get("generated"))
+
+    def get(self, term: str) -> Optional[Dict]:
+        """Entry for a term ({"url", "source", "category"}), or None if not in the table."""
+        return self.entries.get(term)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def set(self, term: str, category: str, url: Optional[str], source: str):
+        """Record a resolution. A None url records a curated term with no link."""
+        self.entries[term] = {"url": url, "source": source, "category": category}
+
+    def save(self):
+        """Write the table atomically, with sorted keys so rebuilds diff cleanly."""
+        self.generated = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        data = {
+            "version": STATIC_TABLE_VERSION,
+            "generated": self.generated,
+            "entries": dict(sorted(self.entries.items())),
+        }
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def build(self, fetcher, terms: Iterable[Tuple[str, str]], refresh: bool = False,
+              log=print) -> Dict[str, int]:
+        """
+        Resolve terms against the live sources and store them in the table.
+
+        Terms already in the table are skipped unless refresh is set.
+        Returns counts of resolved, linked and skipped terms.
+        """
+        counts = {"resolved": 0, "linked": 0, "skipped": 0}
+        for term, category in terms:
+            if term in self.entries and not refresh:
+                counts["skipped"] += 1
+                continue
+
+            log(f"\nResolving: {term} ({category})")
+            url, source = fetcher.resolve_from_sources(term, category)
+            self.set(term, category, url, source)
+            counts["resolved"] += 1
+            if url:
+                counts["linked"] += 1
+        return counts
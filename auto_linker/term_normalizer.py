@@ -0,0 +1,127 @@
+"""
+Term Normalizer - Maps surface variants of a term to one canonical key.
+
+"Chalmers'", "Schrodinger Equation" vs "Schrödinger Equation", "Klein Gordon
+Equation" vs "Klein-Gordon Equation" and "wave function" all come out of the
+scanner as different strings. canonical_key() folds possessives, diacritics,
+hyphenation and case, so the scanner, the cache and the resolver treat them
+as the same term. A VariantIndex maps canonical keys back to a preferred
+spelling, and for curated multi-word terms also folds a plural head ("Wave
+Functions"). Plurals are never folded otherwise: "Mills" is not "Mill".
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from config import KNOWN_TERMS, GLOSSARY_TERMS
+
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "ʼ": "'", "`": "'"})
+_SEPARATORS = re.compile(r"[\s\-_‐-―]+")
+_EDGE_PUNCTUATION = ".,;:!?\"()[]{}"
+
+
+def fold_diacritics(text: str) -> str:
+    """Strip accents: "Schrödinger" -> "Schrodinger"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+# KNOWN_TERMS categories that name people; their last word is a surname, not a plural
+PERSON_CATEGORIES = {"physicist", "philosopher"}
+
+
+def _singular(word: str) -> str:
+    """Crude English singular for the head word of a phrase."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "shes", "ches", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=8192)
+def canonical_key(term: str) -> str:
+    """
+    The key every spelling variant of a term shares: possessives,
+    diacritics, hyphenation and case are folded. Plurals are not ("Mills"
+    is not "Mill"); see VariantIndex for curated plurals. It is only for
+    matching - never display it.
+    """
+    text = fold_diacritics(term).translate(_APOSTROPHES).casefold()
+
+    words = []
+    for word in _SEPARATORS.split(text):
+        word = word.strip(_EDGE_PUNCTUATION)
+        if word.endswith("'s"):
+            word = word[:-2]
+        word = word.rstrip("'")
+        if word:
+            words.append(word)
+    return " ".join(words)
+
+
+def plural_key(term: str) -> Optional[str]:
+    """
+    canonical_key with the head word singularised, for multi-word phrases
+    only ("Wave Functions" -> "wave function"). None for single words,
+    where folding would merge distinct names ("Mills", "Logos").
+    """
+    words = canonical_key(term).split(" ")
+    if len(words) < 2:
+        return None
+    return " ".join(words[:-1] + [_singular(words[-1])])
+
+
+def is_proper_noun(term: str) -> bool:
+    """
+    Whether a curated term is a name that must appear capitalised in the
+    text: every KNOWN_TERMS entry except common-noun concepts.
+    """
+    return term in KNOWN_TERMS and KNOWN_TERMS[term].get("category") != "concept"
+
+
+class VariantIndex:
+    """
+    Canonical key -> preferred spelling. The first spelling added for a key
+    wins. Multi-word terms with a common-noun head ("Friedmann Equations",
+    not "Von Neumann") also match their singular/plural forms.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self.forms: Dict[str, str] = {}
+        self.plural_forms: Dict[str, str] = {}
+        for term in terms:
+            self.add(term)
+
+    def add(self, term: str):
+        self.forms.setdefault(canonical_key(term), term)
+        person = KNOWN_TERMS.get(term, {}).get("category") in PERSON_CATEGORIES
+        key = plural_key(term)
+        if key and not person:
+            self.plural_forms.setdefault(key, term)
+
+    def get(self, term: str) -> Optional[str]:
+        """Preferred spelling for any variant of term, or None if unknown."""
+        exact = self.forms.get(canonical_key(term))
+        if exact is not None:
+            return exact
+        key = plural_key(term)
+        return self.plural_forms.get(key) if key else None
+
+    def __contains__(self, term: str) -> bool:
+        return self.get(term) is not None
+
+    def __len__(self) -> int:
+        return len(self.forms)
+
+
+@lru_cache(maxsize=1)
+def curated_variants() -> VariantIndex:
+    """Variant index of the curated lexicon; KNOWN_TERMS wins over the glossary."""
+    return VariantIndex(list(KNOWN_TERMS) + list(GLOSSARY_TERMS))
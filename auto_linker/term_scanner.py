@@ -8,6 +8,9 @@ from pathlib import Path
 from typing import List, Dict, Set, Tuple, Optional
 from dataclasses import dataclass
 from config import KNOWN_TERMS, GLOSSARY_TERMS, TERM_CATEGORIES
+from markdown_segmenter import mask_non_prose
+from term_normalizer import canonical_key, curated_variants, fold_diacritics, is_proper_noun
+from tracing import Tracer
 
 
 @dataclass
@@ -20,12 +23,18 @@ class FoundTerm:
     is_proper_noun: bool
     is_glossary_term: bool
     needs_linking: bool = True
+    surface: str = ""  # Spelling in the document, when it differs from term
 
 
 class TermScanner:
     """Scans text for proper nouns and terms that should be linked."""
 
-    def __init__(self):
+    def __init__(self, markdown_aware: bool = True, tracer: Optional[Tracer] = None):
+        self.tracer = tracer or Tracer()
+        # When set, code, front matter, URLs, HTML and math are never scanned
+        self.markdown_aware = markdown_aware
+        # Maps spelling variants ("Schrodinger", "Klein Gordon") to curated terms
+        self.variants = curated_variants()
         # Compile patterns for efficiency
         self._compile_patterns()
 
@@ -53,30 +62,77 @@ class TermScanner:
             r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b'
         )
 
-        # Already linked pattern - don't re-link
+        # Already linked patterns - don't re-link. One per output format,
+        # so re-linking a file written with --format html or plain is a no-op
         self.already_linked_pattern = re.compile(
             r'\[([^\]]+)\]\([^)]+\)'
         )
+        self.html_linked_pattern = re.compile(
+            r'<a\b[^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL
+        )
+        # Plain links are "Term: url"; the term is some suffix of the words before it
+        self.plain_linked_pattern = re.compile(
+            r'((?:[^\s:]+[ \t]+){0,5}[^\s:]+): (?:https?|ftp)://'
+        )
 
         # Build known terms pattern for fast matching
-        known_terms_escaped = [re.escape(t) for t in KNOWN_TERMS.keys()]
-        if known_terms_escaped:
-            self.known_terms_pattern = re.compile(
-                r'\b(' + '|'.join(known_terms_escaped) + r')\b',
-                re.IGNORECASE
-            )
-        else:
-            self.known_terms_pattern = None
+        self.known_terms_pattern = self._variant_pattern(KNOWN_TERMS.keys())
 
         # Glossary terms pattern
-        glossary_escaped = [re.escape(t) for t in GLOSSARY_TERMS]
-        if glossary_escaped:
-            self.glossary_pattern = re.compile(
-                r'\b(' + '|'.join(glossary_escaped) + r')\b',
-                re.IGNORECASE
-            )
+        self.glossary_pattern = self._variant_pattern(GLOSSARY_TERMS)
+
+    def _variant_pattern(self, terms) -> Optional[re.Pattern]:
+        """
+        Case-insensitive pattern for terms that also accepts their unaccented
+        spelling and either a space or a hyphen between words. Longer terms
+        come first so "Bell's Inequality" isn't matched as just "Bell".
+        """
+        alternatives = set()
+        for term in terms:
+            for form in (term, fold_diacritics(term)):
+                escaped = re.escape(form).replace(r'\-', r'[-\s]').replace(r'\ ', r'[-\s]')
+                alternatives.add(escaped)
+        if not alternatives:
+            return None
+        ordered = sorted(alternatives, key=lambda a: (-len(a), a))
+        return re.compile(r'\b(' + '|'.join(ordered) + r')\b', re.IGNORECASE)
+
+    def _curated_match(self, surface: str) -> Optional[str]:
+        """
+        Curated spelling for a matched surface, or None. Names must be
+        capitalised in the text: "church bell" is not the physicist Bell.
+        """
+        canonical = self.variants.get(surface)
+        if canonical and is_proper_noun(canonical) and not surface[:1].isupper():
+            return None
+        return canonical
+
+    def _add_curated(self, found_terms: List[FoundTerm], seen_terms: Set[str], canonical: str,
+                     surface: str, line_number: int, context: str):
+        """Record a curated term once, however many of its variants appear."""
+        key = canonical_key(canonical)
+        if key not in seen_terms:
+            found_terms.append(self._curated_term(canonical, surface, line_number, context))
+            seen_terms.add(key)
+        seen_terms.add(canonical_key(surface))
+
+    def _curated_term(self, canonical: str, surface: str, line_number: int, context: str) -> FoundTerm:
+        """FoundTerm for a curated term (KNOWN_TERMS first, then the glossary)."""
+        if canonical in KNOWN_TERMS:
+            category = KNOWN_TERMS[canonical].get("category", "unknown")
+            is_proper_noun, is_glossary_term = True, False
         else:
-            self.glossary_pattern = None
+            category = "concept"
+            is_proper_noun, is_glossary_term = False, True
+        return FoundTerm(
+            term=canonical,
+            category=category,
+            line_number=line_number,
+            context=context,
+            is_proper_noun=is_proper_noun,
+            is_glossary_term=is_glossary_term,
+            surface=surface if surface != canonical else ""
+        )
 
     def _get_context(self, text: str, match_start: int, match_end: int, context_chars: int = 50) -> str:
         """Get surrounding context for a match."""
@@ -110,8 +166,13 @@ class TermScanner:
     def _extract_already_linked(self, text: str) -> Set[str]:
         """Find terms that are already linked in the text."""
         linked = set()
-        for match in self.already_linked_pattern.finditer(text):
-            linked.add(match.group(1).lower())
+        for pattern in (self.already_linked_pattern, self.html_linked_pattern):
+            for match in pattern.finditer(text):
+                linked.add(canonical_key(match.group(1)))
+        for match in self.plain_linked_pattern.finditer(text):
+            words = match.group(1).split()
+            for i in range(len(words)):
+                linked.add(canonical_key(" ".join(words[i:])))
         return linked
 
     def scan_text(self, text: str) -> List[FoundTerm]:
@@ -121,11 +182,15 @@ class TermScanner:
         Returns a list of FoundTerm objects.
         """
         found_terms: List[FoundTerm] = []
-        seen_terms: Set[str] = set()  # Avoid duplicates
+        seen_terms: Set[str] = set()  # Canonical keys, so variants count as duplicates
 
         # Get already linked terms
         already_linked = self._extract_already_linked(text)
 
+        # Match against prose only; the masked copy keeps offsets and line
+        # numbers aligned with the original, which is still used for context
+        scan_target = mask_non_prose(text) if self.markdown_aware else text
+
         # Split into lines for line number tracking
         lines = text.split('\n')
         current_pos = 0
@@ -142,76 +207,63 @@ class TermScanner:
 
         # 1. First, find known terms (highest priority)
         if self.known_terms_pattern:
-            for match in self.known_terms_pattern.finditer(text):
+            for match in self.known_terms_pattern.finditer(scan_target):
                 term = match.group(1)
-                normalized = term.lower()
+                normalized = canonical_key(term)
 
                 if normalized in seen_terms or normalized in already_linked:
                     continue
 
                 # Find the canonical form from KNOWN_TERMS
-                canonical = None
-                for known in KNOWN_TERMS.keys():
-                    if known.lower() == normalized:
-                        canonical = known
-                        break
+                canonical = self._curated_match(term)
 
-                if canonical:
-                    term_info = KNOWN_TERMS[canonical]
-                    found_terms.append(FoundTerm(
-                        term=canonical,
-                        category=term_info.get("category", "unknown"),
-                        line_number=get_line_number(match.start()),
-                        context=self._get_context(text, match.start(), match.end()),
-                        is_proper_noun=True,
-                        is_glossary_term=False
-                    ))
-                    seen_terms.add(normalized)
+                if canonical in KNOWN_TERMS:
+                    self._add_curated(found_terms, seen_terms, canonical, term,
+                                      get_line_number(match.start()),
+                                      self._get_context(text, match.start(), match.end()))
 
         # 2. Find glossary terms
         if self.glossary_pattern:
-            for match in self.glossary_pattern.finditer(text):
+            for match in self.glossary_pattern.finditer(scan_target):
                 term = match.group(1)
-                normalized = term.lower()
+                normalized = canonical_key(term)
 
                 if normalized in seen_terms or normalized in already_linked:
                     continue
 
                 # Find canonical form
-                canonical = None
-                for gloss in GLOSSARY_TERMS:
-                    if gloss.lower() == normalized:
-                        canonical = gloss
-                        break
+                canonical = self._curated_match(term)
 
                 if canonical:
-                    found_terms.append(FoundTerm(
-                        term=canonical,
-                        category="concept",
-                        line_number=get_line_number(match.start()),
-                        context=self._get_context(text, match.start(), match.end()),
-                        is_proper_noun=False,
-                        is_glossary_term=True
-                    ))
-                    seen_terms.add(normalized)
+                    self._add_curated(found_terms, seen_terms, canonical, term,
+                                      get_line_number(match.start()),
+                                      self._get_context(text, match.start(), match.end()))
 
         # 3. Find potential proper nouns (capitalized words not at sentence start)
-        for match in self.proper_noun_pattern.finditer(text):
+        for match in self.proper_noun_pattern.finditer(scan_target):
             term = match.group(1)
-            normalized = term.lower()
+            normalized = canonical_key(term)
 
             if normalized in seen_terms or normalized in already_linked:
                 continue
 
+            # Variants of curated terms ("Wave Functions", "Klein Gordon Equation")
+            canonical = self._curated_match(term)
+            if canonical:
+                self._add_curated(found_terms, seen_terms, canonical, term,
+                                  get_line_number(match.start()),
+                                  self._get_context(text, match.start(), match.end()))
+                continue
+
             # Skip if at sentence start (might just be regular capitalization)
-            if self._is_sentence_start(text, match.start()):
+            if self._is_sentence_start(scan_target, match.start()):
                 continue
 
             # Skip common words that are often capitalized
             skip_words = {'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of',
                          'and', 'or', 'but', 'is', 'are', 'was', 'were', 'be',
                          'this', 'that', 'these', 'those', 'it', 'its'}
-            if normalized in skip_words:
+            if term.lower() in skip_words:
                 continue
 
             # Skip very short words
@@ -231,15 +283,22 @@ class TermScanner:
             seen_terms.add(normalized)
 
         # 4. Find Title Case phrases (potential theory/concept names)
-        for match in self.title_case_pattern.finditer(text):
+        for match in self.title_case_pattern.finditer(scan_target):
             term = match.group(1)
-            normalized = term.lower()
+            normalized = canonical_key(term)
 
             if normalized in seen_terms or normalized in already_linked:
                 continue
 
+            canonical = self._curated_match(term)
+            if canonical:
+                self._add_curated(found_terms, seen_terms, canonical, term,
+                                  get_line_number(match.start()),
+                                  self._get_context(text, match.start(), match.end()))
+                continue
+
             # Skip if it's at the start of a sentence
-            if self._is_sentence_start(text, match.start()):
+            if self._is_sentence_start(scan_target, match.start()):
                 continue
 
             # This could be a theory or concept name
@@ -260,10 +319,12 @@ class TermScanner:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
+        with self.tracer.span("read_file", path=str(file_path)):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
 
-        return self.scan_text(text)
+        with self.tracer.span("scan_text", path=str(file_path), chars=len(text)):
+            return self.scan_text(text)
 
     def scan_directory(self, dir_path: Path, pattern: str = "*.md") -> Dict[Path, List[FoundTerm]]:
         """Scan all markdown files in a directory."""
@@ -0,0 +1,46 @@
+"""
+Tests for AutoLinker's file and directory linking.
+
+Run with: python -m pytest test_auto_linker.py
+"""
+
+from pathlib import Path
+
+import pytest
+
+from auto_linker import AutoLinker
+from static_table import StaticLinkTable
+
+LINKS = {
+    "Einstein:physicist": {"url": "https://en.wikipedia.org/wiki/Albert_Einstein", "source": "Wikipedia"},
+    "Wheeler:physicist": {"url": "https://en.wikipedia.org/wiki/John_Archibald_Wheeler", "source": "Wikipedia"},
+}
+
+
+def make_linker(tmp_path: Path) -> AutoLinker:
+    """AutoLinker that links Einstein and Wheeler from its cache, with no network."""
+    linker = AutoLinker(verbose=False)
+    fetcher = linker.fetcher
+    fetcher.cache_enabled = False
+    fetcher.static_table = StaticLinkTable(tmp_path / "static_links.json")
+    fetcher.set_cache(dict(LINKS))
+    fetcher.resolve_from_sources = lambda term, category=None: (None, "")
+    return linker
+
+
+@pytest.mark.parametrize("link_format", ["markdown", "html", "plain"])
+def test_in_place_linking_is_idempotent(tmp_path, link_format):
+    notes = tmp_path / "notes"
+    notes.mkdir()
+    note = notes / "note.md"
+    note.write_text("We read Einstein and Wheeler.\n\nLater, Einstein again.\n", encoding="utf-8")
+    linker = make_linker(tmp_path)
+
+    first = linker.link_directory(notes, in_place=True, link_format=link_format)
+    linked = note.read_text(encoding="utf-8")
+    second = linker.link_directory(notes, in_place=True, link_format=link_format)
+
+    assert first["files_written"] == 1
+    assert linked.count("https://en.wikipedia.org/wiki/Albert_Einstein") == 1
+    assert second["files_written"] == 0
+    assert note.read_text(encoding="utf-8") == linked
@@ -0,0 +1,19 @@
+"""
+Tests for cost_estimator.py request counting.
+
+Run with: python -m pytest test_cost_estimator.py
+"""
+
+from cost_estimator import CostEstimator
+from link_fetcher import LinkFetcher
+from term_scanner import TermScanner
+
+
+def test_sep_probes_each_slug_once():
+    fetcher = LinkFetcher(cache_enabled=False, verbose=False)
+    urls = fetcher.sep_entry_urls("wave function")
+    assert len(urls) == len(set(urls)) == 5
+    assert len(fetcher.sep_entry_urls("einstein")) == 4  # Dropping hyphens changes nothing
+
+    requests, _ = CostEstimator(TermScanner(), fetcher).source_requests("SEP", "wave function")
+    assert requests == 6  # Five probes plus the search page
@@ -0,0 +1,48 @@
+"""
+Tests for link_index.py queries.
+
+Run with: python -m pytest test_link_index.py
+"""
+
+import pytest
+
+from link_index import LinkIndex
+
+
+def file_index(path: str, *terms: str) -> dict:
+    return {
+        "source_file": path,
+        "total_terms": len(terms),
+        "linked_terms": len(terms),
+        "terms": {term: {"url": f"https://example.org/{term}", "source": "Wikipedia", "category": "concept"}
+                  for term in terms},
+    }
+
+
+def build_index(output_dir, *file_indexes):
+    store = LinkIndex.create(output_dir)
+    for index in file_indexes:
+        store.add_file_index(index)
+    store.close()
+
+
+def test_ambiguous_suffix_is_refused(tmp_path):
+    build_index(tmp_path,
+                file_index("/vault/sub/n1.md", "Quantum Gravity"),
+                file_index("/vault/out/sub/n1.md", "Quantum Gravity", "Decoherence"))
+    with LinkIndex.open(tmp_path) as store:
+        with pytest.raises(ValueError, match="matches 2 files"):
+            store.terms_for_file("sub/n1.md")
+        path, terms = store.terms_for_file("out/sub/n1.md")
+        assert path == "/vault/out/sub/n1.md"
+        assert [t["term"] for t in terms] == ["Decoherence", "Quantum Gravity"]
+        assert store.terms_for_file("/vault/sub/n1.md")[0] == "/vault/sub/n1.md"
+        assert store.terms_for_file("missing.md") == (None, [])
+
+
+def test_open_escapes_uri_characters(tmp_path):
+    output_dir = tmp_path / "odd?name#50%"
+    output_dir.mkdir()
+    build_index(output_dir, file_index("/vault/n1.md", "Entropy"))
+    with LinkIndex.open(output_dir) as store:
+        assert store.files_for_term("Entropy") == ["/vault/n1.md"]
@@ -0,0 +1,50 @@
+"""
+Tests for probe_engine.py against a local HTTP server.
+
+Run with: python -m pytest test_probe_engine.py
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from probe_engine import ProbeEngine
+
+
+class TruncatingHandler(BaseHTTPRequestHandler):
+    """Rejects HEAD, then promises a longer GET body than it sends."""
+
+    def do_HEAD(self):
+        self.send_response(405)
+        self.end_headers()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        self.wfile.write(b"short body")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), TruncatingHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_truncated_get_body_is_a_miss(server):
+    engine = ProbeEngine(requests.Session())
+    result = engine.probe(f"{server}/entries/einstein/")
+    assert result.exists is False
+    assert result.method == "GET"
+    assert result.status == 200
@@ -0,0 +1,31 @@
+"""
+Tests for source_stats.py adaptive ordering.
+
+Run with: python -m pytest test_source_stats.py
+"""
+
+from config import ADAPTIVE_ORDERING
+from source_stats import SourceStats
+
+SOURCES = ["SEP", "PhilPapers", "Scholarpedia", "Wikipedia"]
+
+
+def make_stats(tmp_path, hit_rates, attempts=30) -> SourceStats:
+    """Stats with attempts probes per source at the given hit rates; no exploration."""
+    stats = SourceStats(tmp_path / "source_stats.json", settings={**ADAPTIVE_ORDERING, "explore_every": 0})
+    for source, hit_rate in hit_rates.items():
+        hits = round(attempts * hit_rate)
+        for i in range(attempts):
+            stats.record("equation", source, i < hits, 0.2)
+    return stats
+
+
+def test_zero_hit_source_is_skipped_even_when_last(tmp_path):
+    stats = make_stats(tmp_path, {"SEP": 0.0, "Scholarpedia": 0.5, "Wikipedia": 0.9})
+    assert stats.order("equation", SOURCES) == ["Wikipedia", "PhilPapers", "Scholarpedia"]
+
+
+def test_best_source_is_kept_when_all_fall_below_threshold(tmp_path):
+    stats = make_stats(tmp_path, {"SEP": 0.0, "Scholarpedia": 0.0, "Wikipedia": 0.0}, attempts=100)
+    stats.record("equation", "Scholarpedia", True, 0.2)
+    assert stats.order("equation", SOURCES) == ["Scholarpedia", "PhilPapers"]
@@ -0,0 +1,100 @@
+"""
+Tests for term_normalizer.py and how the scanner and fetcher use it.
+
+Pins the variants that must share one key and the distinct terms that must
+not collide. Run with: python -m pytest test_term_normalizer.py
+"""
+
+from pathlib import Path
+
+from auto_linker import AutoLinker
+from static_table import StaticLinkTable
+from term_normalizer import canonical_key, curated_variants
+from term_scanner import TermScanner
+
+
+def make_linker(tmp_path: Path, cache: dict) -> AutoLinker:
+    """AutoLinker with the given cache, no static table and no network."""
+    linker = AutoLinker(verbose=False)
+    fetcher = linker.fetcher
+    fetcher.cache_enabled = False
+    fetcher.static_table = StaticLinkTable(tmp_path / "static_links.json")
+    fetcher.set_cache(dict(cache))
+    fetcher.resolve_from_sources = lambda term, category=None: (None, "")
+    return linker
+
+
+def test_variants_share_a_key():
+    assert canonical_key("Chalmers'") == canonical_key("Chalmers")
+    assert canonical_key("Bell’s Inequality") == canonical_key("Bell's Inequality")
+    assert canonical_key("Schrodinger Equation") == canonical_key("Schrödinger Equation")
+    assert canonical_key("Klein Gordon equation") == canonical_key("Klein-Gordon Equation")
+
+
+def test_single_words_never_fold_plurals():
+    assert canonical_key("Mills") != canonical_key("Mill")
+    assert canonical_key("Collins") == "collins"
+    assert canonical_key("Logo") != canonical_key("Logos")
+
+
+def test_curated_plurals_fold_for_phrases_only():
+    variants = curated_variants()
+    assert variants.get("Wave Functions") == "Wave Function"
+    assert variants.get("Friedmann Equation") == "Friedmann Equations"
+    assert variants.get("Logo") is None
+    assert variants.get("Bells") is None
+
+
+def test_scanner_keeps_distinct_names():
+    found = [(t.term, t.category) for t in TermScanner().scan_text("We read Mill and then Mills, Collins too.")]
+    assert ("Mill", "unknown") in found
+    assert ("Mills", "unknown") in found
+    assert ("Collins", "unknown") in found
+
+
+def test_scanner_does_not_turn_logo_into_logos():
+    terms = TermScanner().scan_text("We saw Logo here")
+    assert [t.term for t in terms] == ["Logo"]
+    assert terms[0].category == "unknown"
+
+
+def test_lowercase_names_are_not_known_terms():
+    terms = TermScanner().scan_text("The church bell rang while a turing machine hummed")
+    assert terms == []
+
+
+def test_lowercase_glossary_concepts_still_match():
+    terms = TermScanner().scan_text("Measuring causes decoherence of the quantum state.")
+    assert {t.term for t in terms} == {"Decoherence", "Quantum State"}
+
+
+def test_mill_link_does_not_spill_onto_mills(tmp_path):
+    linker = make_linker(tmp_path, {"Mill:unknown": {"url": "https://plato.stanford.edu/entries/mill/", "source": "SEP"}})
+    assert linker.generate_linked_text("We read Mills", link_all=True) == "We read Mills"
+    assert linker.fetcher.local_link("Mills", "unknown") is None
+
+
+def test_lowercase_names_are_not_linked(tmp_path):
+    linker = make_linker(tmp_path, {
+        "Bell:physicist": {"url": "https://example.org/Bell", "source": "Wikipedia"},
+        "Turing:physicist": {"url": "https://example.org/Turing", "source": "Wikipedia"},
+    })
+    text = "The church bell rang while a turing machine hummed"
+    assert linker.generate_linked_text(text, link_all=True) == text
+
+
+def test_variants_hit_the_cache(tmp_path):
+    linker = make_linker(tmp_path, {
+        "Chalmers:philosopher": {"url": "https://example.org/chalmers", "source": "SEP"},
+        "Schrödinger Equation:equation": {"url": "https://example.org/schrodinger", "source": "Wikipedia"},
+    })
+    fetcher = linker.fetcher
+    assert fetcher.get_link("Chalmers'", "philosopher") == ("https://example.org/chalmers", "SEP")
+    assert fetcher.get_link("Schrodinger equations", "equation") == ("https://example.org/schrodinger", "Wikipedia")
+
+
+def test_background_misses_are_shared_by_plural_variants(tmp_path):
+    linker = make_linker(tmp_path, {})
+    resolver = linker.background
+    assert resolver.submit("Wave Functions", "concept").result() == (None, "")
+    assert resolver.local_result("Wave Function", "concept") == (None, "")
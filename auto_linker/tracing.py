@@ -0,0 +1,126 @@
+"""
+Tracing - Per-phase timing and profiling for auto-linker runs.
+
+Tracer records named spans (read_file, scan_text, get_link, fetch, cache_save,
+write_index, ...) as Chrome trace events, which load directly into
+chrome://tracing or https://ui.perfetto.dev. profile_call runs a command under
+cProfile and tracemalloc and writes the hotspots to a text report.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Dict, List
+
+
+class Tracer:
+    """Collects Chrome trace-event spans. Disabled tracers cost one branch per span."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[Dict] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def span(self, name: str, category: str = "phase", **args):
+        """Context manager timing one span. Extra keyword args show up in the trace viewer."""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _span(self, name: str, category: str, args: Dict):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start,
+                "dur": self._now_us() - start,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self.events.append(event)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Total time and count per span name, in milliseconds."""
+        totals: Dict[str, Dict] = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            entry = totals.setdefault(event["name"], {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += event["dur"] / 1000
+        return dict(sorted(totals.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+    def save(self, path: Path):
+        """Write the trace as Chrome trace-event JSON."""
+        with self._lock:
+            events = list(self.events)
+        thread_names = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": thread.ident,
+             "args": {"name": thread.name}}
+            for thread in threading.enumerate()
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": thread_names + events, "displayTimeUnit": "ms"}, f)
+
+
+def profile_call(func: Callable, report_path: Path, top: int = 30):
+    """
+    Run func() under cProfile and tracemalloc, then write the top hotspots
+    (by cumulative and own time) and allocation sites to report_path.
+    Returns whatever func returns.
+    """
+    profiler = cProfile.Profile()
+    tracemalloc.start(10)
+    started = time.perf_counter()
+    try:
+        profiler.enable()
+        try:
+            return func()
+        finally:
+            profiler.disable()
+    finally:
+        elapsed = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        out = io.StringIO()
+        out.write(f"Wall time: {elapsed:.3f}s\n")
+        out.write(f"Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n")
+
+        for sort_key in ("cumulative", "tottime"):
+            out.write(f"\n{'='*60}\nTOP {top} FUNCTIONS BY {sort_key.upper()}\n{'='*60}\n")
+            pstats.Stats(profiler, stream=out).strip_dirs().sort_stats(sort_key).print_stats(top)
+
+        out.write(f"\n{'='*60}\nTOP {top} ALLOCATION SITES\n{'='*60}\n")
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            out.write(f"{stat.size / 1024:10.1f} KiB  {stat.count:8d} blocks  {frame.filename}:{frame.lineno}\n")
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
+        print(f"Profile report saved to: {report_path}")